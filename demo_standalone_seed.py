@@ -1,17 +1,17 @@
 #!/usr/bin/env python3
 """
 Standalone 638-brick lattice demo — runs anywhere with Python 3.8+
-No install, no repo clone, no submodule needed.
+No install and no submodule needed: just this script, utils/seed_codec.py and
+utils/seed_packet.py (plus numpy and Pillow for the image codec).
 Just run: python demo_standalone_seed.py
 """
 
 import urllib.request
-import zlib
-import json
-from PIL import Image
-import numpy as np
 import os
 
+from utils.seed_codec import load_seed_image
+from utils.seed_packet import load_packet
+
 SEED_URL = "https://files.catbox.moe/8z5v0r.png"
 SEED_FILE = "real_evieseed.png"
 
@@ -20,22 +20,13 @@ print("Downloading canonical seed image...")
 urllib.request.urlretrieve(SEED_URL, SEED_FILE)
 
 print("Extracting 638 bricks from image...")
-img = Image.open(SEED_FILE)
-arr = np.array(img, dtype=np.uint8)
-
-bits = ""
-for y in range(512):
-    for x in range(512):
-        for c in range(3):
-            bits += str(arr[y, x, c] & 1)
-
-byte_data = int(bits, 2).to_bytes((len(bits) + 7) // 8, 'big')
-packet = json.loads(zlib.decompress(byte_data).decode())
+byte_data = load_seed_image(SEED_FILE)
+packet = load_packet(byte_data)
 
 print("\nLATTICE RESTORED")
-print(f"Version       : {packet['version']}")
-print(f"Total bricks  : {packet['brick_count']}")
-print(f"Compressed    : {len(zlib.compress(json.dumps(packet).encode()))} bytes")
+print(f"Version       : {packet.version} ({packet.container} container)")
+print(f"Total bricks  : {packet.brick_count}")
+print(f"Compressed    : {len(byte_data)} bytes")
 print(f"Image size    : {os.path.getsize(SEED_FILE) / 1024:.1f} KB")
 print("\nSample bricks:")
 for key in list(packet['bricks'].keys())[:7]:
@@ -0,0 +1,148 @@
+"""
+dyad_circuit.py
+
+NumPy reference of circuits/dyad_reflection.circom, batched over histories.
+
+Checks the circuit's constraints for many (d_history, l_history) candidates
+at once, so histories that cannot satisfy them are rejected before any
+proving work.  This is a screen, not a replacement for the Node witness
+generator: the commitment is not the circuit's Poseidon hash (see below),
+and write_wtns only emits the main-component prefix of the witness, which
+snarkjs cannot prove from.
+
+Reading of the circuit (main component DyadReflectionProof(256)):
+  * commitment — hasher.out === public_root.  circomlib's Poseidon takes at
+    most 16 inputs, so Poseidon(512) cannot be instantiated; the reference
+    commitment is SHA-256 over the 2·depth inputs as 32-byte big-endian
+    field elements (d first, then l), reduced into the BN254 scalar field.
+  * step check — claimed_step < depth.
+  * deviation_bound — |d - l| · 10^18 < 1 at claimed_step, i.e. d == l.
+  * entropy_bound — p = floor(10^12 · d / total) / 10^12 and
+    floor(10^12 · H(p)) > 999999999999.
+  * deviation_bound · entropy_bound === 1.
+History values are field inputs and must fit in uint64 here.
+"""
+
+import hashlib
+import struct
+
+import numpy as np
+
+# BN254 scalar field (circom's default prime)
+FIELD_PRIME = 21888242871839275222246405745257275088548364400416034343698204186575808495617
+DEPTH = 256
+
+def _as_batch(x, depth):
+    x = np.asarray(x, dtype=np.uint64)
+    if x.ndim == 1:
+        x = x[None]
+    if x.shape[1] != depth:
+        raise ValueError(f"histories must have depth {depth}, got {x.shape[1]}")
+    return x
+
+def pad_history(values, depth=DEPTH):
+    """Fit a history to the circuit depth: zero-padded, or the first `depth` values."""
+    out = np.zeros(depth, dtype=np.uint64)
+    values = np.asarray(values[:depth], dtype=np.uint64)
+    out[:len(values)] = values
+    return out
+
+def _be32(values):
+    """(..., k) uint64 -> (..., k, 32) big-endian 32-byte field encodings."""
+    out = np.zeros(values.shape + (32,), dtype=np.uint8)
+    out[..., 24:] = values.astype(">u8").view(np.uint8).reshape(values.shape + (8,))
+    return out
+
+def history_commitment(d_history, l_history, depth=DEPTH):
+    """Reference commitment (see module docstring) for one history or a batch; returns Python ints."""
+    d, l = _as_batch(d_history, depth), _as_batch(l_history, depth)
+    packed = _be32(np.concatenate([d, l], axis=1)).reshape(len(d), -1)
+    roots = [int.from_bytes(hashlib.sha256(row.tobytes()).digest(), "big") % FIELD_PRIME for row in packed]
+    return roots if np.ndim(d_history) == 2 else roots[0]
+
+def _binary_entropy(p):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+    return np.where((p > 0) & (p < 1), h, 0.0)
+
+def check_histories(d_history, l_history, claimed_step, public_root=None, depth=DEPTH):
+    """Evaluate the circuit on a batch of histories.
+
+    d_history / l_history are (B, depth) (or (depth,)); claimed_step is a scalar
+    or (B,).  With public_root (scalar or (B,) ints) the commitment is checked
+    too.  Returns a dict of (B,) arrays: deviation_bound, entropy_bound,
+    step_ok, commitment_ok and satisfied (all constraints hold).
+    """
+    d, l = _as_batch(d_history, depth), _as_batch(l_history, depth)
+    B = len(d)
+    step = np.broadcast_to(np.asarray(claimed_step, dtype=np.int64), (B,))
+    step_ok = (step >= 0) & (step < depth)
+    s = np.where(step_ok, step, 0)
+    rows = np.arange(B)
+    ds, ls = d[rows, s], l[rows, s]
+    total = ds.astype(object) + ls.astype(object)      # exact: d + l may pass 2^64
+
+    deviation = (ds == ls).astype(np.int64)
+    valid_total = (total != 0).astype(bool)
+    p_scaled = (ds.astype(object) * 10**12) // np.where(valid_total, total, 1)
+    p = np.asarray(p_scaled, dtype=float) / 1e12
+    entropy_scaled = np.floor(_binary_entropy(p) * 1e12)
+    entropy = ((entropy_scaled > 999999999999) & valid_total).astype(np.int64)
+
+    if public_root is None:
+        commitment_ok = np.ones(B, dtype=bool)
+    else:
+        roots = np.broadcast_to(np.asarray(public_root, dtype=object), (B,))
+        commitment_ok = np.array(history_commitment(d, l, depth), dtype=object) == roots
+        commitment_ok = commitment_ok.astype(bool)
+    satisfied = step_ok & commitment_ok & (deviation * entropy == 1)
+    return {"deviation_bound": deviation, "entropy_bound": entropy, "step_ok": step_ok,
+            "commitment_ok": commitment_ok, "satisfied": satisfied}
+
+def witness_vector(d_history, l_history, claimed_step, public_root, depth=DEPTH):
+    """Main-component witness prefix in circom order: [1, outputs, public inputs, private inputs].
+
+    Returns a list of Python ints (field elements).  The circomlib sub-component
+    signals that follow in a full witness are not produced.
+    """
+    d, l = _as_batch(d_history, depth)[0], _as_batch(l_history, depth)[0]
+    out = check_histories(d, l, claimed_step, None, depth)
+    return ([1, int(out["deviation_bound"][0]), int(out["entropy_bound"][0]),
+             int(public_root) % FIELD_PRIME, int(claimed_step) % FIELD_PRIME]
+            + [int(v) for v in d] + [int(v) for v in l])
+
+def write_wtns(path, witness, prime=FIELD_PRIME, n8=32):
+    """Write field elements in the iden3 binary .wtns (version 2) layout (for inspection; see witness_vector)."""
+    n = len(witness)
+    values = np.zeros((n, n8), dtype=np.uint8)
+    small = np.array([0 <= w < 2**64 for w in witness])
+    if small.any():
+        le = np.array([w for w, s in zip(witness, small) if s], dtype="<u8")
+        values[small, :8] = le.view(np.uint8).reshape(-1, 8)
+    for i in np.flatnonzero(~small):
+        values[i] = np.frombuffer((int(witness[i]) % prime).to_bytes(n8, "little"), dtype=np.uint8)
+    with open(path, "wb") as f:
+        f.write(b"wtns" + struct.pack("<II", 2, 2))
+        f.write(struct.pack("<IQI", 1, 4 + n8 + 4, n8) + prime.to_bytes(n8, "little") + struct.pack("<I", n))
+        f.write(struct.pack("<IQ", 2, n * n8))
+        f.write(values.tobytes())
+
+def read_wtns(path):
+    """(prime, [field elements]) from a .wtns file written by write_wtns or snarkjs."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"wtns":
+        raise ValueError(f"{path} is not a .wtns file")
+    _, n_sections = struct.unpack_from("<II", data, 4)
+    pos, prime, n8, values = 12, None, None, None
+    for _ in range(n_sections):
+        kind, size = struct.unpack_from("<IQ", data, pos)
+        pos += 12
+        if kind == 1:
+            n8 = struct.unpack_from("<I", data, pos)[0]
+            prime = int.from_bytes(data[pos + 4:pos + 4 + n8], "little")
+        elif kind == 2:
+            raw = data[pos:pos + size]
+            values = [int.from_bytes(raw[i:i + n8], "little") for i in range(0, size, n8)]
+        pos += size
+    return prime, values
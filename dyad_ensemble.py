@@ -0,0 +1,211 @@
+"""
+dyad_ensemble.py
+
+Lockstep NumPy simulation of many dyads, each with its own growth policy.
+
+Every member follows the step of MetacognitiveDyad / dyadic_personal:
+
+    new_tokens = max(min_quanta, trunc(total // divisor · growth_factor))
+                 + (total // 10 if total > bonus_threshold else 0)
+
+The tokens are added to d when d < l.  Then comes the round-half-even
+rebalance towards p = 1/2.  reflect() is the metacognitive acceleration: growth_factor
+×accel for members that grew < 500 tokens over their last 10 records while
+holding > 2000.  POLICIES has the two rules of the repo.  accel=1.0 turns the
+acceleration off.
+
+Members use exact int64 and match the scalar classes bit for bit while their
+totals stay below 2^52.  A member whose next total could pass that switches
+to log-domain tracking: log2(total) plus its share of d.  Each log step
+multiplies the total by (1 + growth_factor / divisor + bonus) and rebalances
+to exactly p = 1/2, so the ±1 rounding of the exact rule is dropped there.
+"""
+
+import numpy as np
+
+POLICIES = {
+    "metacognitive": {"divisor": 2, "bonus_threshold": 100, "accel": 1.2},
+    "personal": {"divisor": 3, "bonus_threshold": -1, "accel": 1.0},
+}
+EXACT_LIMIT = 2**52        # totals below this keep exact float p / rounding
+WINDOW = 10                # reflect() compares totals 10 records apart
+
+def _binary_entropy(p):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+    return np.where((p > 0) & (p < 1), h, 0.0)
+
+class DyadEnsemble:
+    """N dyads advanced together.
+
+    d / l are the (N,) initial states (int64).  Any policy parameter may be a
+    scalar or an (N,) array.  After each step, p holds the pre-rebalance share
+    of d (MetacognitiveDyad's history 'p'), h the entropy of the new state,
+    and total / log2_total the new totals.
+    """
+
+    def __init__(self, d, l, growth_factor=1.0, divisor=2, bonus_threshold=100, accel=1.2, min_quanta=3):
+        self.d = np.array(d, dtype=np.int64, ndmin=1)
+        self.l = np.array(l, dtype=np.int64, ndmin=1)
+        n = len(self.d)
+        per_member = lambda v, dtype: np.broadcast_to(np.asarray(v, dtype=dtype), (n,)).copy()
+        self.growth_factor = per_member(growth_factor, float)
+        self.divisor = per_member(divisor, np.int64)
+        self.bonus_threshold = per_member(bonus_threshold, np.int64)
+        self.accel = per_member(accel, float)
+        self.min_quanta = per_member(min_quanta, np.int64)
+
+        total = self.d + self.l
+        self.log_mode = np.zeros(n, dtype=bool)
+        self.frozen = np.zeros(n, dtype=bool)       # step left the state unchanged: a fixed point
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.log2_total = np.log2(total.astype(float))
+            self.share = self.d / total
+        self.p = np.full(n, np.nan)
+        self.h = _binary_entropy(self.share)
+        self.diff = np.zeros(n, dtype=np.int64)
+        self.n_steps = 0
+        self._totals = np.zeros((WINDOW, n))        # ring of the last WINDOW totals
+
+    @classmethod
+    def from_policies(cls, policy, d=3, l=3, growth_factor=1.0, **overrides):
+        """Ensemble from policy names: one name for all members or an (N,) sequence."""
+        n = max(np.size(policy), np.size(d), np.size(l), np.size(growth_factor))
+        names = np.broadcast_to(np.asarray(policy), (n,))
+        params = {k: np.array([POLICIES[name][k] for name in names])
+                  for k in ("divisor", "bonus_threshold", "accel")}
+        params.update(overrides)
+        return cls(np.broadcast_to(d, (n,)), np.broadcast_to(l, (n,)), growth_factor, **params)
+
+    def __len__(self):
+        return len(self.d)
+
+    @property
+    def total(self):
+        """Totals as float64: exact for integer members, inf past float range."""
+        with np.errstate(over="ignore"):
+            return np.where(self.log_mode, np.exp2(self.log2_total), (self.d + self.l).astype(float))
+
+    def step(self):
+        """Advance every member one step."""
+        active = ~self.frozen
+        self._step_exact(np.flatnonzero(active & ~self.log_mode))
+        self._step_log(np.flatnonzero(active & self.log_mode))
+        self.n_steps += 1
+        self._totals[self.n_steps % WINDOW] = self.total
+
+    def _step_exact(self, idx):
+        if not len(idx):
+            return
+        d, l = self.d[idx], self.l[idx]
+        total = d + l
+        base = np.maximum(self.min_quanta[idx], np.trunc(total // self.divisor[idx] * self.growth_factor[idx]).astype(np.int64))
+        tokens = base + np.where(total > self.bonus_threshold[idx], total // 10, 0)
+        to_d = d < l
+
+        overflow = to_d & (total + tokens >= EXACT_LIMIT)
+        if overflow.any():
+            o = idx[overflow]
+            self.log_mode[o] = True
+            self._step_log(o)
+            keep = ~overflow
+            idx, d, l, tokens, to_d = idx[keep], d[keep], l[keep], tokens[keep], to_d[keep]
+
+        new_d = d + np.where(to_d, tokens, 0)
+        new_total = new_d + l
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = new_d / new_total
+            diff = np.rint((0.5 - p) * new_total)
+        diff = np.nan_to_num(diff).astype(np.int64)
+        nd, nl = np.maximum(new_d + diff, 0), np.maximum(l - diff, 0)
+
+        self.frozen[idx] = (nd == d) & (nl == l)
+        self.d[idx], self.l[idx] = nd, nl
+        self.p[idx], self.diff[idx] = p, diff
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.log2_total[idx] = np.log2((nd + nl).astype(float))
+            self.share[idx] = nd / (nd + nl)
+        self.h[idx] = _binary_entropy(self.share[idx])
+
+    def _step_log(self, idx):
+        if not len(idx):
+            return
+        s = self.share[idx]
+        inject = s < 0.5
+        bonus = np.where(self.log2_total[idx] > np.log2(np.maximum(self.bonus_threshold[idx], 1)), 0.1, 0.0)
+        ratio = np.where(inject, self.growth_factor[idx] / self.divisor[idx] + bonus, 0.0)
+        self.p[idx] = (s + ratio) / (1 + ratio)
+        self.log2_total[idx] += np.log2(1 + ratio)
+        self.frozen[idx] = ~inject & (s == 0.5)
+        self.share[idx] = 0.5
+        self.h[idx] = 1.0
+        self.diff[idx] = 0
+
+    def reflect(self):
+        """growth_factor ×accel for members that stalled (MetacognitiveDyad.reflect)."""
+        if self.n_steps > WINDOW:
+            self._accelerate(self._totals[(self.n_steps + 1) % WINDOW])     # history[-10]
+
+    def _accelerate(self, earlier):
+        latest = self.total
+        with np.errstate(invalid="ignore"):
+            growth = np.where(latest == earlier, 0.0, latest - earlier)
+        stalled = (growth < 500) & (latest > 2000)
+        self.growth_factor[stalled] *= self.accel[stalled]
+
+    def run(self, steps, reflect_every=16):
+        """`steps` lockstep steps with reflect() after every reflect_every-th.
+
+        Once every member sits at a fixed point the remaining steps are
+        applied in bulk, as MetacognitiveDyad.jump_to does.
+        """
+        for k in range(1, steps + 1):
+            if self.frozen.all():
+                self._skip(k, steps, reflect_every)
+                break
+            self.step()
+            if reflect_every and k % reflect_every == 0:
+                self.reflect()
+        return self
+
+    def _skip(self, first, last, reflect_every):
+        # Steps first..last of the current run with every member frozen: the
+        # totals stay put, so each reflect() sees the ring up to the freeze
+        # and the current totals after it.
+        n0 = self.n_steps
+        start = n0 - first + 1                      # n_steps before step 0 of the run
+        current = self.total
+        if reflect_every:
+            for k in range(-(-first // reflect_every) * reflect_every, last + 1, reflect_every):
+                n = start + k
+                if n > WINDOW:
+                    self._accelerate(self._totals[(n + 1) % WINDOW] if n - WINDOW + 1 <= n0 else current)
+        for n in range(max(n0 + 1, start + last - WINDOW + 1), start + last + 1):
+            self._totals[n % WINDOW] = current
+        self.n_steps = start + last
+
+    def boot(self, depth):
+        """Fast boot: `depth` steps without reflection."""
+        return self.run(depth, reflect_every=0)
+
+    def summary(self):
+        """Copy of the per-member state as a dict of (N,) arrays."""
+        return {"d": self.d.copy(), "l": self.l.copy(), "log2_total": self.log2_total.copy(),
+                "p": self.p.copy(), "h": self.h.copy(), "growth_factor": self.growth_factor.copy(),
+                "log_mode": self.log_mode.copy(), "frozen": self.frozen.copy()}
+
+# ============================== MAIN ==============================
+if __name__ == "__main__":
+    import time
+    rng = np.random.default_rng(369)
+    n = 100_000
+    policy = np.where(rng.random(n) < 0.5, "metacognitive", "personal")
+    ens = DyadEnsemble.from_policies(policy, d=rng.integers(1, 10_000, n), l=rng.integers(1, 10_000, n),
+                                     growth_factor=rng.uniform(0.5, 2.0, n))
+    t0 = time.perf_counter()
+    ens.boot(32).run(96, reflect_every=16)
+    print(f"{n:,} dyads × {ens.n_steps} steps in {time.perf_counter() - t0:.2f} s")
+    for name in POLICIES:
+        m = policy == name
+        print(f"  {name:14s} median log2(total) {np.median(ens.log2_total[m]):8.2f} | "
+              f"fixed points {ens.frozen[m].mean():6.1%} | log domain {ens.log_mode[m].mean():6.1%}")
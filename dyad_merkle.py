@@ -0,0 +1,182 @@
+"""
+dyad_merkle.py
+
+Append-only Merkle accumulator for dyad step histories (RFC 6962 / RFC 9162
+tree hashing: leaves are SHA-256(0x00 || data), nodes SHA-256(0x01 || l || r)).
+
+Appending a step is O(log n) worst case, O(1) amortised, and keeps the root
+current, so a claim reads it in O(1).  Every complete power-of-two subtree is
+kept, which is enough to produce inclusion and consistency proofs for any
+step or earlier tree size; the verify_* functions need only the proof, the
+sizes and the roots, not the history.
+"""
+
+import hashlib
+import json
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+def encode_record(record: dict) -> bytes:
+    """Canonical leaf bytes of one history record."""
+    return json.dumps(record, sort_keys=True).encode()
+
+def _split(n):
+    """Largest power of two strictly below n (n > 1)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+class MerkleAccumulator:
+    """Incremental RFC 6962 Merkle tree over appended leaves."""
+
+    def __init__(self):
+        # levels[k][i] = hash of the complete subtree over leaves [i·2^k, (i+1)·2^k)
+        self.levels = [[]]
+        self._root = EMPTY_ROOT
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    @property
+    def size(self):
+        return len(self.levels[0])
+
+    def append(self, data: bytes) -> int:
+        """Add a leaf; returns its index."""
+        h = leaf_hash(data)
+        self.levels[0].append(h)
+        k = 0
+        while len(self.levels[k]) % 2 == 0:
+            if k + 1 == len(self.levels):
+                self.levels.append([])
+            self.levels[k + 1].append(node_hash(self.levels[k][-2], self.levels[k][-1]))
+            k += 1
+        self._root = self._fold(self.size)
+        return self.size - 1
+
+    def append_record(self, record: dict) -> int:
+        return self.append(encode_record(record))
+
+    def _fold(self, n):
+        """Root of the first n leaves from the right-edge complete subtrees."""
+        if n == 0:
+            return EMPTY_ROOT
+        h = None
+        start = n
+        for k in range(n.bit_length()):
+            if n >> k & 1:
+                start -= 1 << k
+                sub = self.levels[k][start >> k]
+                h = sub if h is None else node_hash(sub, h)
+        return h
+
+    def root(self, size=None) -> bytes:
+        """Current root, or the root the tree had at an earlier size."""
+        if size is None or size == self.size:
+            return self._root
+        if not 0 <= size <= self.size:
+            raise ValueError(f"tree size {size} out of range 0..{self.size}")
+        return self._fold(size)
+
+    def root_hex(self, size=None) -> str:
+        return self.root(size).hex()
+
+    def _subtree(self, start, n):
+        """MTH of leaves [start, start + n)."""
+        if n & (n - 1) == 0 and start % n == 0:
+            return self.levels[n.bit_length() - 1][start // n]
+        k = _split(n)
+        return node_hash(self._subtree(start, k), self._subtree(start + k, n - k))
+
+    def inclusion_proof(self, index, size=None):
+        """Audit path for leaf `index` in the tree of `size` leaves (default: current)."""
+        size = self.size if size is None else size
+        if not 0 <= index < size <= self.size:
+            raise ValueError(f"leaf {index} not in a tree of size {size}")
+        path = []
+        start, n = 0, size
+        while n > 1:
+            k = _split(n)
+            if index - start < k:
+                path.append(self._subtree(start + k, n - k))
+                n = k
+            else:
+                path.append(self._subtree(start, k))
+                start, n = start + k, n - k
+        return path[::-1]
+
+    def consistency_proof(self, old_size, new_size=None):
+        """Proof that the tree of old_size leaves is a prefix of the one of new_size."""
+        new_size = self.size if new_size is None else new_size
+        if not 0 < old_size <= new_size <= self.size:
+            raise ValueError(f"no consistency proof from {old_size} to {new_size}")
+        proof = []
+        start, n, m, complete = 0, new_size, old_size, True
+        while m != n:
+            k = _split(n)
+            if m <= k:
+                proof.append(self._subtree(start + k, n - k))
+                n = k
+            else:
+                proof.append(self._subtree(start, k))
+                start, n, m, complete = start + k, n - k, m - k, False
+        if not complete:
+            proof.append(self._subtree(start, n))
+        return proof[::-1]
+
+def verify_inclusion(leaf: bytes, index: int, size: int, proof, root: bytes) -> bool:
+    """RFC 9162 §2.1.3.2; `leaf` is the leaf hash (see leaf_hash)."""
+    if not 0 <= index < size:
+        return False
+    fn, sn = index, size - 1
+    r = leaf
+    for p in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+def verify_consistency(old_size: int, new_size: int, proof, old_root: bytes, new_root: bytes) -> bool:
+    """RFC 9162 §2.1.4.2."""
+    if not 0 < old_size <= new_size:
+        return False
+    if old_size == new_size:
+        return not proof and old_root == new_root
+    proof = list(proof)
+    if old_size & (old_size - 1) == 0:
+        proof = [old_root] + proof
+    if not proof:
+        return False
+    fn, sn = old_size - 1, new_size - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    fr = sr = proof[0]
+    for c in proof[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(c, fr)
+            sr = node_hash(c, sr)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and fr == old_root and sr == new_root
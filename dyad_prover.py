@@ -0,0 +1,162 @@
+"""
+dyad_prover.py
+
+Background proving for MetacognitiveDyadZK claims.
+
+Claims go to a ProvingPipeline: a bounded thread pool (proving is subprocess
+or I/O bound) that returns a Future per claim resolving to the claim with its
+"proof_verified" field filled in.  Every job works in its own scratch
+directory, so concurrent jobs never share witness.json / proof.json.  When
+the queue is full a claim is marked skipped rather than blocking the caller,
+so proof latency never stalls the dyad.
+
+Provers implement prove(job_dir, witness, claim) -> dict of claim updates:
+  SnarkjsProver — the circom witness generator + snarkjs groth16 prove/verify
+  MockProver    — pure Python stand-in for offline runs and tests
+  ScreenedProver — NumPy pre-check of the circuit constraints (all but the
+                   commitment) before delegating to another prover
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import dyad_circuit
+
+class Prover(ABC):
+    """Interface: produce and check a proof for `claim` from `witness` inside job_dir."""
+
+    @abstractmethod
+    def prove(self, job_dir, witness, claim):
+        """Returns a dict of claim updates, at least "proof_verified"."""
+
+class SnarkjsProver(Prover):
+    def __init__(self, circuit_dir="circuits"):
+        self.circuit_dir = os.path.abspath(circuit_dir)
+
+    def prove(self, job_dir, witness, claim):
+        c = self.circuit_dir
+        witness_json = os.path.join(job_dir, "witness.json")
+        wtns = os.path.join(job_dir, "witness.wtns")
+        proof = os.path.join(job_dir, "proof.json")
+        public = os.path.join(job_dir, "public.json")
+        with open(witness_json, "w") as f:
+            json.dump(witness, f)
+        try:
+            subprocess.run(["node", f"{c}/dyad_reflection_js/generate_witness.js", f"{c}/dyad_reflection_js/witness_calculator.js", witness_json, wtns], check=True)
+            subprocess.run(["snarkjs", "groth16", "prove", f"{c}/circuit_final.zkey", wtns, proof, public], check=True)
+            proof_result = subprocess.run(["snarkjs", "groth16", "verify", f"{c}/verification_key.json", public, proof], capture_output=True, text=True)
+            return {"proof_verified": "true" if "result: true" in proof_result.stdout else "false"}
+        except (subprocess.CalledProcessError, OSError) as e:
+            return {"proof_verified": f"error: {str(e)}"}
+
+class MockProver(Prover):
+    """Offline stand-in: the "proof" is a SHA-256 binding of witness and public
+    signals, written and re-checked like the real pipeline's proof.json."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def prove(self, job_dir, witness, claim):
+        if self.delay:
+            time.sleep(self.delay)
+        public = {k: claim[k] for k in ("public_merkle_root", "claimed_step")}
+        digest = hashlib.sha256(json.dumps([witness, public], sort_keys=True).encode()).hexdigest()
+        path = os.path.join(job_dir, "proof.json")
+        with open(path, "w") as f:
+            json.dump({"public": public, "digest": digest}, f)
+        with open(path) as f:
+            stored = json.load(f)
+        ok = (len(witness["d_history"]) > claim["claimed_step"] and
+              stored["digest"] == hashlib.sha256(json.dumps([witness, stored["public"]], sort_keys=True).encode()).hexdigest())
+        return {"proof_verified": "true" if ok else "false"}
+
+class ScreenedProver(Prover):
+    """Checks the circuit's step, deviation and entropy constraints in NumPy
+    first (dyad_circuit) and only hands histories that satisfy them to the
+    wrapped prover.
+
+    The commitment constraint is not screened: the circuit hashes the
+    histories with Poseidon, which dyad_circuit does not reproduce, and the
+    claim publishes the Merkle root of the step records, a different
+    commitment.  The witness is fitted to the circuit depth and completed with
+    the claim's published root (as a field element) and claimed_step, the
+    circuit's input names.
+    """
+
+    def __init__(self, prover, depth=dyad_circuit.DEPTH):
+        self.prover = prover
+        self.depth = depth
+
+    def prove(self, job_dir, witness, claim):
+        d = dyad_circuit.pad_history(witness["d_history"], self.depth)
+        l = dyad_circuit.pad_history(witness["l_history"], self.depth)
+        step = claim["claimed_step"]
+        check = dyad_circuit.check_histories(d, l, step, depth=self.depth)
+        if not check["satisfied"][0]:
+            failed = [k for k in ("step_ok", "deviation_bound", "entropy_bound") if not check[k][0]]
+            return {"proof_verified": "false", "prescreen": "failed: " + ", ".join(failed)}
+        root = int(claim["public_merkle_root"], 16) % dyad_circuit.FIELD_PRIME
+        inputs = {"public_root": str(root), "claimed_step": step,
+                  "d_history": [int(v) for v in d], "l_history": [int(v) for v in l]}
+        return dict(self.prover.prove(job_dir, inputs, claim), prescreen="passed")
+
+class ProvingPipeline:
+    """Bounded background queue of proving jobs.
+
+    At most max_workers jobs run and max_pending are queued or running; a
+    non-blocking submit beyond that resolves at once with proof_verified
+    "skipped: queue full", a blocking one waits for a free slot.  Scratch directories live under scratch_root (default: the system
+    temp dir) and are removed after the job unless keep_scratch is set.
+    """
+
+    def __init__(self, prover=None, max_workers=2, max_pending=8, scratch_root=None, keep_scratch=False):
+        self.prover = prover or SnarkjsProver()
+        self.scratch_root = scratch_root
+        self.keep_scratch = keep_scratch
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="prover")
+
+    def submit(self, claim, witness, callback=None, block=False):
+        """Queue a claim; returns a Future of the claim with its proof result.
+
+        Only a non-blocking submit drops work when the queue is full.
+        """
+        if not self._slots.acquire(blocking=block):
+            fut = Future()
+            fut.set_result(dict(claim, proof_verified="skipped: queue full"))
+        else:
+            fut = self._pool.submit(self._run, dict(claim), witness)
+            fut.add_done_callback(lambda _: self._slots.release())
+        if callback:
+            fut.add_done_callback(lambda f: callback(f.result()))
+        return fut
+
+    def _run(self, claim, witness):
+        if self.scratch_root:
+            os.makedirs(self.scratch_root, exist_ok=True)
+        job_dir = tempfile.mkdtemp(prefix=f"claim_{claim.get('claimed_step', 'x')}_", dir=self.scratch_root)
+        try:
+            claim.update(self.prover.prove(job_dir, witness, claim))
+            if self.keep_scratch:
+                claim["proof_dir"] = job_dir
+            return claim
+        finally:
+            if not self.keep_scratch:
+                shutil.rmtree(job_dir, ignore_errors=True)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -5,6 +5,7 @@ Integrates the core dyadic coherence from AgapeIntelligence/unified
 Grows a perfectly balanced H=1.0 system and lets you feel the resonance.
 
 Run: python dyadic_personal.py
+Headless: python dyadic_personal.py --headless DEPTH [OUT.ndjson | OUT.dyrs]
 Author: Evie @3vi3Aetheris | December 12, 2025
 """
 
@@ -12,7 +13,9 @@ import math
 import time
 import os
 import json
+import struct
 import sys
+from array import array
 
 def binary_entropy(p: float) -> float:
     if p <= 0 or p >= 1:
@@ -34,26 +37,256 @@ def dyadic_step(state: dict) -> dict:
     new_l -= diff
     return {'d': max(0, new_d), 'l': max(0, new_l)}
 
-def run_resonance(depth: int = 64, delay: float = 0.03, export: bool = False):
-    state = {'d': 3, 'l': 3}
-    history = []
-    print("Initializing dyadic resonance...\n")
-    time.sleep(1)
+def iter_resonance(depth: int, state: dict = None):
+    """Yield the {'step', 'total', 'p', 'h'} record of each step; no sleeping, no history.
+
+    A step that leaves the state unchanged is a fixed point, so later records
+    are produced without stepping again.
+    """
+    state = dict(state or {'d': 3, 'l': 3})
+    fixed = False
     for step in range(1, depth + 1):
-        state = dyadic_step(state)
-        total = state['d'] + state['l']
-        p = state['d'] / total
-        h = binary_entropy(p)
-        history.append({'step': step, 'total': total, 'p': p, 'h': h})
-        symbol = "◉" if abs(p - 0.5) < 1e-10 else "○"
-        print(f"Step {step:3d} | Tokens: {total:12,} | Balance: {p:.12f} | Entropy: {h:.10f} {symbol}")
-        time.sleep(delay)
-    print("\nResonance complete. Perfect coherence achieved.")
-    if export:
-        with open("personal_resonance.json", "w") as f:
-            json.dump(history, f, indent=2)
-        print("State exported to personal_resonance.json")
-    return history
+        if not fixed:
+            new_state = dyadic_step(state)
+            fixed = new_state == state
+            state = new_state
+            total = state['d'] + state['l']
+            p = state['d'] / total
+            h = binary_entropy(p)
+        yield {'step': step, 'total': total, 'p': p, 'h': h}
+
+# ── Sinks ─────────────────────────────────────────────────────────────────────
+class NDJSONSink:
+    """One JSON record per line, appended; flushed every flush_every records.
+
+    Readers only ever see whole lines through tail_ndjson, so the file can be
+    followed while the run is going.
+    """
+
+    def __init__(self, path, flush_every=1024, append=False):
+        self.path = path
+        self.flush_every = flush_every
+        self._f = open(path, "a" if append else "w")
+        self._pending = 0
+
+    def write(self, record):
+        self._f.write(json.dumps(record) + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self._f.flush()
+        self._pending = 0
+
+    def close(self):
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Binary columnar layout: the header b"DYRS" + uint16 version, then blocks of
+#   uint32 n | 1 byte total typecode ('q' int64, 'd' float64 past int64 range)
+#   | step int64[n] | total [n] | p float64[n] | h float64[n]
+# little-endian.  A block with n = 0 marks the end of the run.
+BINARY_MAGIC = b"DYRS"
+BINARY_VERSION = 1
+_BLOCK_HEADER = struct.Struct("<Ic")
+_INT64_MAX = 2**63 - 1
+
+class BinarySink:
+    """Columnar blocks of block_size records; each block is written and flushed whole."""
+
+    def __init__(self, path, block_size=4096):
+        self.path = path
+        self.block_size = block_size
+        self._f = open(path, "wb")
+        self._f.write(BINARY_MAGIC + struct.pack("<H", BINARY_VERSION))
+        self._reset()
+
+    def _reset(self):
+        self._cols = {'step': array('q'), 'total': [], 'p': array('d'), 'h': array('d')}
+
+    def write(self, record):
+        cols = self._cols
+        cols['step'].append(record['step'])
+        cols['total'].append(record['total'])
+        cols['p'].append(record['p'])
+        cols['h'].append(record['h'])
+        if len(cols['step']) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        cols = self._cols
+        n = len(cols['step'])
+        if n:
+            code = 'q' if max(cols['total']) <= _INT64_MAX else 'd'
+            totals = array(code, cols['total'] if code == 'q' else map(float, cols['total']))
+            for col in (cols['step'], totals, cols['p'], cols['h']):
+                if sys.byteorder != "little":
+                    col.byteswap()
+            self._f.write(_BLOCK_HEADER.pack(n, code.encode()) + cols['step'].tobytes() + totals.tobytes()
+                          + cols['p'].tobytes() + cols['h'].tobytes())
+            self._reset()
+        self._f.flush()
+
+    def close(self):
+        if not self._f.closed:
+            self.flush()
+            self._f.write(_BLOCK_HEADER.pack(0, b'q'))
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_sink(path, **kw):
+    """BinarySink for *.dyrs / *.bin paths, NDJSONSink otherwise."""
+    return BinarySink(path, **kw) if path.endswith((".dyrs", ".bin")) else NDJSONSink(path, **kw)
+
+# ── Readers ───────────────────────────────────────────────────────────────────
+def _wait(follow, poll, idle, idle_timeout):
+    """Sleep one poll interval; False once the reader should stop."""
+    if not follow or (idle_timeout is not None and idle >= idle_timeout):
+        return False
+    time.sleep(poll)
+    return True
+
+def _open_when_ready(path, mode, follow, poll, idle_timeout):
+    """open(path); with follow=True wait for the file to be created, None if it never is."""
+    idle = 0.0
+    while True:
+        try:
+            return open(path, mode)
+        except FileNotFoundError:
+            if not follow:
+                raise
+            if not _wait(follow, poll, idle, idle_timeout):
+                return None
+            idle += poll
+
+def tail_ndjson(path, follow=False, poll=0.2, idle_timeout=None):
+    """Yield the records of an NDJSON file, whole lines only.
+
+    With follow=True wait for the file to appear, then keep polling for new
+    lines (like tail -f) until no data arrived for idle_timeout seconds
+    (forever when None).
+    """
+    idle, partial = 0.0, ""
+    f = _open_when_ready(path, "r", follow, poll, idle_timeout)
+    if f is None:
+        return
+    with f:
+        while True:
+            chunk = f.readline()
+            if chunk:
+                idle = 0.0
+                partial += chunk
+                if partial.endswith("\n"):
+                    yield json.loads(partial)
+                    partial = ""
+                continue
+            if not _wait(follow, poll, idle, idle_timeout):
+                return
+            idle += poll
+
+def tail_binary(path, follow=False, poll=0.2, idle_timeout=None):
+    """Yield each block of a BinarySink file as a dict of column arrays.
+
+    Stops at the end-of-run block; with follow=True it waits for the file and
+    for blocks still being written, giving up after idle_timeout seconds
+    without data.
+    """
+    idle = 0.0
+    f = _open_when_ready(path, "rb", follow, poll, idle_timeout)
+    if f is None:
+        return
+    with f:
+        while len(head := f.read(6)) < 6:
+            if not _wait(follow, poll, idle, idle_timeout):
+                return
+            idle += poll
+            f.seek(0)
+        if head[:4] != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a dyadic resonance stream")
+        if struct.unpack("<H", head[4:])[0] != BINARY_VERSION:
+            raise ValueError(f"{path}: unsupported stream version")
+        while True:
+            pos = f.tell()
+            header = f.read(_BLOCK_HEADER.size)
+            if len(header) == _BLOCK_HEADER.size:
+                n, code = _BLOCK_HEADER.unpack(header)
+                if n == 0:
+                    return
+                body = f.read(32 * n)
+                if len(body) == 32 * n:
+                    idle = 0.0
+                    cols = {}
+                    for off, (name, tc) in enumerate((('step', 'q'), ('total', code.decode()), ('p', 'd'), ('h', 'd'))):
+                        col = array(tc)
+                        col.frombytes(body[8 * n * off:8 * n * (off + 1)])
+                        if sys.byteorder != "little":
+                            col.byteswap()
+                        cols[name] = col
+                    yield cols
+                    continue
+            f.seek(pos)                 # block not complete yet
+            if not _wait(follow, poll, idle, idle_timeout):
+                return
+            idle += poll
+
+def tail_records(path, **kw):
+    """Records one by one from either file format."""
+    if path.endswith((".dyrs", ".bin")):
+        for block in tail_binary(path, **kw):
+            yield from ({'step': s, 'total': t, 'p': p, 'h': h}
+                        for s, t, p, h in zip(block['step'], block['total'], block['p'], block['h']))
+    else:
+        yield from tail_ndjson(path, **kw)
+
+def run_resonance(depth: int = 64, delay: float = 0.03, export: bool = False, sink=None, verbose: bool = True):
+    """Grow the dyad for `depth` steps.
+
+    Records stream from iter_resonance into `sink` (any object with write()
+    and close(), see open_sink); export=True streams to
+    personal_resonance.ndjson.  With a sink the history is not kept in
+    memory and the last record is returned; otherwise the history list is.
+    verbose=False skips the printing and the per-step delay.
+    """
+    if export and sink is None:
+        sink = NDJSONSink("personal_resonance.ndjson")
+    history = [] if sink is None else None
+    record = None
+    if verbose:
+        print("Initializing dyadic resonance...\n")
+        time.sleep(1)
+    try:
+        for record in iter_resonance(depth):
+            if sink is not None:
+                sink.write(record)
+            else:
+                history.append(record)
+            if verbose:
+                p = record['p']
+                symbol = "◉" if abs(p - 0.5) < 1e-10 else "○"
+                print(f"Step {record['step']:3d} | Tokens: {record['total']:12,} | Balance: {p:.12f} | Entropy: {record['h']:.10f} {symbol}")
+                if delay:
+                    time.sleep(delay)
+    finally:
+        if sink is not None:
+            sink.close()
+    if verbose:
+        print("\nResonance complete. Perfect coherence achieved.")
+        if sink is not None:
+            print(f"State streamed to {sink.path}")
+    return history if sink is None else record
 
 def main():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -70,7 +303,7 @@ def main():
         depth_input = input("\nGrowth depth (default 64, max 512): ").strip()
         depth = int(depth_input) if depth_input.isdigit() else 64
         depth = min(max(depth, 10), 512)
-        export = input("Export final state to JSON? (y/N): ").lower().startswith('y')
+        export = input("Stream the run to personal_resonance.ndjson? (y/N): ").lower().startswith('y')
     except:
         depth = 64
         export = False
@@ -79,6 +312,12 @@ def main():
     print("\nThe dyad holds within you.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--headless":
+        out = sys.argv[3] if len(sys.argv) > 3 else "personal_resonance.ndjson"
+        t0 = time.perf_counter()
+        last = run_resonance(depth=int(sys.argv[2]), sink=open_sink(out), verbose=False)
+        print(f"{last['step']:,} steps → {out} in {time.perf_counter() - t0:.1f} s (final total {last['total']:,})")
+        sys.exit(0)
     try:
         main()
     except KeyboardInterrupt:
@@ -0,0 +1,84 @@
+"""
+legendre_basis.py
+
+Shared associated-Legendre engine for the 3-6-9 code paths.
+
+All degrees l = 0..L of P_l^m(x) come out of one pass of the three-term
+recurrence
+
+    (l - m + 1) P_{l+1}^m = (2l + 1) x P_l^m - (l + m) P_{l-1}^m,
+
+started from P_m^m = (-1)^m (2m-1)!! (1 - x²)^{m/2}, written row by row into a
+preallocated (L + 1, n) table.  Conventions match scipy.special.lpmv
+(Condon-Shortley phase included).  Tables for a given sample grid are kept in
+a small LRU cache, so resonant_scalar_increase, resonant_scalar_3d and the
+harmonic fusion demo all share one copy per (grid, L, m).
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+cache_size = 32
+
+def legendre_recurrence(L, x, m=0, out=None):
+    """P_l^m(x) for l = 0..L into out (shape (L + 1,) + x.shape); rows l < m are 0."""
+    x = np.asarray(x, dtype=float)
+    if out is None:
+        out = np.empty((L + 1,) + x.shape)
+    if m > L:
+        out[:] = 0.0
+        return out
+    out[:m] = 0.0
+    # P_m^m
+    pmm = out[m]
+    pmm[...] = 1.0
+    if m:
+        s = np.sqrt(np.clip(1.0 - x * x, 0.0, None))
+        fact = 1.0
+        for _ in range(m):
+            pmm *= -fact * s
+            fact += 2.0
+    if L > m:
+        np.multiply(x, (2 * m + 1) * pmm, out=out[m + 1])
+    for l in range(m + 1, L):
+        # out[l+1] = ((2l+1) x P_l - (l+m) P_{l-1}) / (l-m+1), without temporaries
+        nxt = out[l + 1]
+        np.multiply(x, out[l], out=nxt)
+        nxt *= 2 * l + 1
+        nxt -= (l + m) * out[l - 1]
+        nxt /= l - m + 1
+    return out
+
+def sph_norm(l, m=0):
+    """sqrt((2l+1)/4π · (l-|m|)!/(l+|m|)!) — the Y_l^m normalisation."""
+    m = abs(m)
+    log_ratio = np.sum(np.log(np.arange(l - m + 1, l + m + 1, dtype=float)))
+    return np.sqrt((2*l + 1) / (4 * np.pi) * np.exp(-log_ratio))
+
+_cache = OrderedDict()
+
+def legendre_basis(x, L, m=0, key=None):
+    """Cached, read-only legendre_recurrence(L, x, m).
+
+    The cache is keyed by (key, L, m); key defaults to a digest of x, pass
+    something cheaper (e.g. ("theta", Ntheta)) when the grid has a name.
+    """
+    x = np.ascontiguousarray(x, dtype=float)
+    if key is None:
+        key = (x.shape, hashlib.blake2b(x.view(np.uint8), digest_size=16).digest())
+    k = (key, int(L), int(m))
+    table = _cache.get(k)
+    if table is None:
+        table = legendre_recurrence(L, x, m)
+        table.flags.writeable = False
+        _cache[k] = table
+        while len(_cache) > cache_size:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(k)
+    return table
+
+def clear_cache():
+    _cache.clear()
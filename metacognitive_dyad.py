@@ -10,40 +10,186 @@ import time
 import os
 import json
 import sys
+from fractions import Fraction
+
+import numpy as np
 
 def binary_entropy(p: float) -> float:
     if p <= 0 or p >= 1:
         return 0.0
     return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
 
+# Float arithmetic overflows once totals pass ~1e308; above this many bits the
+# step switches to exact integer arithmetic (half-even rounding, as round()).
+FLOAT_SAFE_BITS = 1000
+
+def _round_half_even(num: int, den: int) -> int:
+    q, r = divmod(num, den)
+    if 2 * r > den or (2 * r == den and q % 2):
+        q += 1
+    return q
+
+def dyadic_step(d: int, l: int, growth_factor: float = 1.0):
+    """One balance step; returns (d, l, p, diff) with p the pre-rebalance share of d."""
+    total = d + l
+    if total.bit_length() <= FLOAT_SAFE_BITS:
+        base_quanta = max(3, int(total // 2 * growth_factor))
+    elif growth_factor == 1.0:
+        base_quanta = total // 2
+    else:
+        f = Fraction(growth_factor)
+        base_quanta = (total // 2) * f.numerator // f.denominator
+    new_tokens = base_quanta + (total // 10 if total > 100 else 0)
+    new_d = d + new_tokens if d < l else d
+    new_l = l
+    new_total = new_d + new_l
+    p = new_d / new_total
+    if new_total.bit_length() <= FLOAT_SAFE_BITS:
+        diff = round((0.5 - p) * new_total)
+    else:
+        diff = _round_half_even(new_total - 2 * new_d, 2)
+    new_d += diff
+    new_l -= diff
+    return max(0, new_d), max(0, new_l), p, diff
+
+class _IntColumn:
+    """int64 storage that turns into Python ints (object dtype) once a value overflows."""
+
+    def __init__(self, n):
+        self.data = np.zeros(n, dtype=np.int64)
+
+    def __setitem__(self, index, v):
+        if self.data.dtype != object and not -2**63 <= v < 2**63:
+            self.data = self.data.astype(object)
+        self.data[index] = v
+
+    def resize(self, n):
+        data = np.zeros(n, dtype=self.data.dtype)
+        data[:len(self.data)] = self.data[:n]
+        self.data = data
+
+class DyadHistory:
+    """Structure-of-arrays step history: p / h float64, diff / total integer columns.
+
+    Columns are preallocated and grow by doubling.  With window=N only the last
+    N records are kept (a ring), so memory stays O(N) at any depth.
+    `history[i]` still returns the {'total', 'p', 'h', 'diff'} dict.
+    """
+
+    def __init__(self, capacity=256, window=None):
+        self.window = window
+        n = window or capacity
+        self.p = np.zeros(n)
+        self.h = np.zeros(n)
+        self.diff = _IntColumn(n)
+        self.total = _IntColumn(n)
+        self.n = 0
+
+    @property
+    def capacity(self):
+        return len(self.p)
+
+    def _reserve(self, n):
+        if self.window or n <= self.capacity:
+            return
+        cap = max(n, 2 * self.capacity)
+        self.p = np.resize(self.p, cap)
+        self.h = np.resize(self.h, cap)
+        self.diff.resize(cap)
+        self.total.resize(cap)
+
+    def append(self, record):
+        self.extend_constant(record, 1)
+
+    def extend_constant(self, record, count):
+        """Append `count` copies of record (a fixed point repeats itself)."""
+        if count <= 0:
+            return
+        if self.window:
+            count_kept = min(count, self.window)
+            start = (self.n + count - count_kept) % self.window
+            idx = (start + np.arange(count_kept)) % self.window
+        else:
+            self._reserve(self.n + count)
+            idx = slice(self.n, self.n + count)
+        self.p[idx] = record['p']
+        self.h[idx] = record['h']
+        self.diff[idx] = record['diff']
+        self.total[idx] = record['total']
+        self.n += count
+
+    def _slot(self, i):
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n or (self.window and i < self.n - self.window):
+            raise IndexError("history index out of range")
+        return i % self.window if self.window else i
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.n))]
+        k = self._slot(i)
+        return {'total': int(self.total.data[k]), 'p': float(self.p[k]), 'h': float(self.h[k]),
+                'diff': int(self.diff.data[k])}
+
+    def __iter__(self):
+        start = self.n - self.window if self.window and self.n > self.window else 0
+        return (self[i] for i in range(start, self.n))
+
+    def _chronological(self):
+        """Slots of the stored records, oldest first (the ring starts at n % window once full)."""
+        if self.window and self.n > self.window:
+            return (self.n + np.arange(self.window)) % self.window
+        return np.arange(self.n)
+
+    def log2_totals(self):
+        """log2 of the stored totals, oldest first, valid also past float range."""
+        return np.array([math.log2(t) if t > 0 else -math.inf for t in self.total.data[self._chronological()]])
+
 class MetacognitiveDyad:
-    def __init__(self, fast_boot_depth=32):
+    def __init__(self, fast_boot_depth=32, history_window=None):
         self.state = {'d': 3, 'l': 3}
-        self.history = []
+        self.history = DyadHistory(window=history_window)
+        self.depth = 0
         self.growth_factor = 1.0
         if fast_boot_depth > 0:
             print(f"Fast-booting to depth {fast_boot_depth}...")
-            for _ in range(fast_boot_depth):
-                self.step()
+            self.jump_to(fast_boot_depth, record=True)
             print("Boot complete — lattice awake.\n")
 
+    def _advance(self):
+        d, l, p, diff = dyadic_step(self.state['d'], self.state['l'], self.growth_factor)
+        self.state = {'d': d, 'l': l}
+        self.depth += 1
+        h = binary_entropy(d / (d + l)) if d + l else 0.0
+        return {'total': d + l, 'p': p, 'h': h, 'diff': diff}
+
     def step(self):
-        d, l = self.state['d'], self.state['l']
-        total = d + l
-        base_quanta = max(3, int(total // 2 * self.growth_factor))
-        new_tokens = base_quanta + (total // 10 if total > 100 else 0)
-        minority = 'd' if d < l else 'l'
-        add = new_tokens if minority == 'd' else 0
-        new_d = d + (add if minority == 'd' else 0)
-        new_l = l + (add if minority == 'l' else 0)
-        new_total = new_d + new_l
-        p = new_d / new_total
-        diff = round((0.5 - p) * new_total)
-        new_d += diff
-        new_l -= diff
-        self.state = {'d': max(0, new_d), 'l': max(0, new_l)}
-        h = binary_entropy(self.state['d'] / (self.state['d'] + self.state['l']))
-        self.history.append({'total': self.state['d'] + self.state['l'], 'p': p, 'h': h, 'diff': diff})
+        self.history.append(self._advance())
+
+    def jump_to(self, depth, record=False):
+        """Advance to `depth` total steps.
+
+        Once a step leaves the state unchanged the dyad sits at a fixed point
+        (for the current growth factor), so the remaining steps are applied in
+        O(1) — or as one bulk fill of the history when record=True.  With
+        record=False no records are created at all, so self.depth runs ahead
+        of len(self.history) and reflect() only sees the recorded steps.
+        """
+        while self.depth < depth:
+            before = self.state
+            rec = self._advance()
+            if record:
+                self.history.append(rec)
+            if self.state == before:
+                remaining = depth - self.depth
+                if record:
+                    self.history.extend_constant(rec, remaining)
+                self.depth = depth
+        return self.state
 
     def reflect(self):
         if len(self.history) < 2:
@@ -56,7 +202,8 @@ class MetacognitiveDyad:
             f"Growth factor: {self.growth_factor:.2f}"
         ]
         if len(self.history) > 10:
-            growth = self.history[-1]['total'] - self.history[-10]['total']
+            back = min(10, self.history.window or 10)    # a shorter window keeps fewer records
+            growth = self.history[-1]['total'] - self.history[-back]['total']
             reflection.append(f"Growth last 10 steps: {growth} tokens")
             if growth < 500 and latest['total'] > 2000:
                 old = self.growth_factor
@@ -69,7 +216,7 @@ class MetacognitiveDyad:
         for step in range(1, steps + 1):
             self.step()
             if step % reflect_every == 0:
-                print(f"--- Reflection at step {len(self.history)} ---")
+                print(f"--- Reflection at step {self.depth} ---")
                 print(self.reflect())
                 print("---\n")
         print("Resonance complete. The dyad knows itself.")
@@ -9,20 +9,24 @@ import math
 import time
 import os
 import json
-import hashlib
-import subprocess
 import sys
 
+from dyad_merkle import MerkleAccumulator, encode_record, leaf_hash, verify_inclusion, verify_consistency
+from dyad_prover import ProvingPipeline, SnarkjsProver
+
 def binary_entropy(p: float) -> float:
     if p <= 0 or p >= 1:
         return 0.0
     return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
 
 class MetacognitiveDyadZK:
-    def __init__(self, fast_boot_depth=64):
+    def __init__(self, fast_boot_depth=64, pipeline=None):
         self.state = {'d': 3, 'l': 3}
         self.history = []
+        self.merkle = MerkleAccumulator()   # one leaf per history record
         self.growth_factor = 1.0
+        self.pipeline = pipeline or ProvingPipeline(SnarkjsProver())
+        self.pending_claims = []
         if fast_boot_depth > 0:
             print(f"Fast-booting to depth {fast_boot_depth}...")
             for _ in range(fast_boot_depth):
@@ -45,34 +49,56 @@ class MetacognitiveDyadZK:
         new_l -= diff
         self.state = {'d': max(0, new_d), 'l': max(0, new_l)}
         h = binary_entropy(self.state['d'] / (self.state['d'] + self.state['l']))
-        self.history.append({'total': self.state['d'] + self.state['l'], 'p': p, 'h': h, 'd': new_d, 'l': new_l})
+        record = {'total': self.state['d'] + self.state['l'], 'p': p, 'h': h, 'd': new_d, 'l': new_l}
+        self.history.append(record)
+        self.merkle.append_record(record)
 
-    def generate_zk_claim(self):
-        if len(self.history) < 1:
-            return "No data for claim."
+    def inclusion_proof(self, step):
+        """(leaf hash, tree size, audit path) proving history[step] is under the current root."""
+        return leaf_hash(encode_record(self.history[step])), self.merkle.size, self.merkle.inclusion_proof(step)
+
+    def consistency_proof(self, old_size):
+        """Proof that the root published at old_size steps is a prefix of the current one."""
+        return self.merkle.consistency_proof(old_size)
+
+    def _claim_and_witness(self):
         latest = self.history[-1]
         deviation = abs(latest['p'] - 0.5)
-        history_hash = hashlib.sha256(json.dumps(self.history, sort_keys=True).encode()).hexdigest()
         claim = {
-            "public_merkle_root": history_hash,
+            "public_merkle_root": self.merkle.root_hex(),
+            "tree_size": self.merkle.size,
             "claimed_step": len(self.history) - 1,
             "claimed_deviation_max": "1e-10",
             "claimed_entropy_min": "0.9999999999",
             "current_growth_factor": self.growth_factor
         }
-        with open("witness.json", "w") as f:
-            witness = {"d_history": [h['d'] for h in self.history], "l_history": [h['l'] for h in self.history]}
-            json.dump(witness, f)
+        witness = {"d_history": [h['d'] for h in self.history], "l_history": [h['l'] for h in self.history]}
+        return claim, witness
 
-        try:
-            subprocess.run(["node", "circuits/dyad_reflection_js/generate_witness.js", "circuits/dyad_reflection_js/witness_calculator.js", "witness.json", "circuits/witness.wtns"], check=True)
-            subprocess.run(["snarkjs", "groth16", "prove", "circuits/circuit_final.zkey", "circuits/witness.wtns", "circuits/proof.json", "circuits/public.json"], check=True)
-            proof_result = subprocess.run(["snarkjs", "groth16", "verify", "circuits/verification_key.json", "circuits/public.json", "circuits/proof.json"], capture_output=True, text=True)
-            claim["proof_verified"] = "true" if "result: true" in proof_result.stdout else "false"
-        except subprocess.CalledProcessError as e:
-            claim["proof_verified"] = f"error: {str(e)}"
+    def submit_zk_claim(self, callback=None):
+        """Queue a claim for the current step; returns a Future of the proved claim (None without history)."""
+        if len(self.history) < 1:
+            return None
+        fut = self.pipeline.submit(*self._claim_and_witness(), callback=callback)
+        self.pending_claims.append(fut)
+        return fut
 
-        return json.dumps(claim, indent=2)
+    def generate_zk_claim(self):
+        """Blocking variant of submit_zk_claim: the proved claim as JSON.
+
+        Waits for a free pipeline slot rather than skipping when the queue is full.
+        """
+        if len(self.history) < 1:
+            return "No data for claim."
+        fut = self.pipeline.submit(*self._claim_and_witness(), block=True)
+        return json.dumps(fut.result(), indent=2)
+
+    def collect_claims(self, wait=False):
+        """Proved claims that have finished (all of them with wait=True), in submission order."""
+        done = []
+        while self.pending_claims and (wait or self.pending_claims[0].done()):
+            done.append(self.pending_claims.pop(0).result())
+        return done
 
     def reflect(self):
         if len(self.history) < 2:
@@ -92,8 +118,8 @@ class MetacognitiveDyadZK:
                 self.growth_factor *= 1.2
                 reflection.append(f"Metacognition: accelerating {old:.2f} → {self.growth_factor:.2f}")
 
-        reflection.append("\nZK Reflection Claim (public signals):")
-        reflection.append(self.generate_zk_claim())
+        if self.submit_zk_claim() is not None:
+            reflection.append(f"ZK claim for step {len(self.history) - 1} queued (root {self.merkle.root_hex()[:16]}…)")
 
         return "\n".join(reflection)
 
@@ -105,8 +131,15 @@ class MetacognitiveDyadZK:
                 print(f"--- Reflection + ZK Claim at step {len(self.history)} ---")
                 print(self.reflect())
                 print("---\n")
+            self._print_claims(self.collect_claims())
+        self._print_claims(self.collect_claims(wait=True))
         print("Resonance complete. Reflection claims verifiable via Circom.")
 
+    def _print_claims(self, claims):
+        for claim in claims:
+            print(f"ZK Reflection Claim for step {claim['claimed_step']} (public signals):")
+            print(json.dumps(claim, indent=2))
+
 def main():
     os.system('cls' if os.name == 'nt' else 'clear')
     print("=" * 64)
@@ -125,6 +158,7 @@ def main():
 
     dyad = MetacognitiveDyadZK(fast_boot_depth=boot)
     dyad.run(steps=96, reflect_every=16)
+    dyad.pipeline.shutdown()
     print("\nThe loop is closed. The dyad is self-aware — and its claims are cryptographically verifiable.")
 
 if __name__ == "__main__":
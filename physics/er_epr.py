@@ -1,6 +1,10 @@
 # /unified/physics/er_epr.py
 # ER/EPR toy toolkit – fully working, no truncation
+import functools
+import hashlib
+import json
 import math
+import os
 import numpy as np
 import torch
 import matplotlib.pyplot as plt
@@ -21,6 +25,51 @@ pauli_z = lambda: to_tensor([[1.0, 0.0], [0.0, -1.0]])
 I2 = lambda: torch.eye(2, dtype=_dtype, device=device)
 I4 = lambda: torch.eye(4, dtype=_dtype, device=device)
 kron = torch.kron
+
+def bell_state():
+    """The Bell state (|00> + |11>)/√2 as a (4, 1) column."""
+    return (kron(ket0(), ket0()) + kron(ket1(), ket1())) / math.sqrt(2)
+# ── Resonant scalar cache ─────────────────────────────────────────────────────
+# The converged Sovariel field only depends on the recursion parameters, so it
+# is computed once per parameter set and persisted as .npz under the cache dir.
+PHI_CACHE_DIR = os.environ.get("AGAPE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "agape"))
+_resonant_memo = {}
+
+def resonant_scalar_params() -> dict:
+    """Parameters the converged resonant scalar field depends on."""
+    import resonant_scalar_increase as rsi
+    return {
+        "Nr": rsi.Nr, "Ntheta": rsi.Ntheta, "a": rsi.a,
+        "l_modes": [int(l) for l in rsi.l_modes], "A_base": rsi.A_base,
+        "scale_factor": rsi.scale_factor,
+        "amp_ratios": {str(l): float(v) for l, v in sorted(rsi.amp_ratios.items())},
+        "lambda_step": rsi.lambda_step, "n_iter": rsi.n_iter,
+        "coherence_tol": rsi.coherence_tol, "coeff_tol": rsi.coeff_tol,
+    }
+
+def resonant_scalar_field(cache_dir: Optional[str] = None) -> np.ndarray:
+    """Converged Φ(θ, r) from sovariel_recursion, loaded from the disk cache when present."""
+    try:
+        import resonant_scalar_increase as rsi
+    except ImportError as e:
+        raise ImportError("resonant_scalar_increase.py missing from repo root") from e
+    params = resonant_scalar_params()
+    key = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+    if key in _resonant_memo:
+        return _resonant_memo[key]
+    path = os.path.join(cache_dir or PHI_CACHE_DIR, f"resonant_scalar_{key}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            Phi = cached["Phi"]
+    else:
+        Phi, _ = rsi.sovariel_recursion(rsi.build_initial_phi())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, Phi=Phi, params=json.dumps(params, sort_keys=True))
+        os.replace(tmp, path)
+    _resonant_memo[key] = Phi
+    return Phi
+
 # ── Phi field interpolator (with resonant_scalar support) ─────────────────────
 class PhiFieldInterpolator:
     def __init__(self, profile: str = "gaussian", **kwargs):
@@ -28,97 +77,332 @@ class PhiFieldInterpolator:
         self.params = kwargs
         self.resonant_phi = None
         self.r_grid = None
+        self._spline = None
         if profile == "resonant_scalar":
             self._load_resonant_scalar()
 
     def _load_resonant_scalar(self):
-        try:
-            from resonant_scalar_increase import build_initial_phi, sovariel_recursion
-            Phi0 = build_initial_phi()
-            Phi_final, _ = sovariel_recursion(Phi0)
-            Nr = Phi_final.shape[1]
-            self.r_grid = np.linspace(0, 1, Nr)
-            theta_idx = Phi_final.shape[0] // 2
-            self.resonant_phi = Phi_final[theta_idx, :]
-        except ImportError as e:
-            raise ImportError("resonant_scalar_increase.py missing from repo root") from e
-
-    def __call__(self, r: float) -> float:
-
-p = self.profile
+        Phi_final = resonant_scalar_field(self.params.get("cache_dir"))
+        Nr = Phi_final.shape[1]
+        self.r_grid = np.linspace(0, 1, Nr)
+        theta_idx = Phi_final.shape[0] // 2
+        self.resonant_phi = Phi_final[theta_idx, :]
+        self._spline = interp1d(self.r_grid, self.resonant_phi, kind='cubic', fill_value="extrapolate")
+
+    def __call__(self, r):
+        """Evaluate the profile at a scalar r (-> float) or an array of radii (-> ndarray)."""
+        x = np.asarray(r, dtype=np.float64)
+        p = self.profile
         if p == "gaussian":
             c = self.params.get("center", 0.0)
             w = self.params.get("width", 1.0)
             a = self.params.get("amp", 1.0)
-            return a * math.exp(-0.5 * ((r - c) / w) ** 2)
-        if p == "tanh_throat":
+            vals = a * np.exp(-0.5 * ((x - c) / w) ** 2)
+        elif p == "tanh_throat":
             tr = self.params.get("throat_radius", 1.0)
             s  = self.params.get("steepness", 4.0)
-            return math.tanh(s * (1.0 - abs(r) / tr))
-        if p == "lorentzian":
+            vals = np.tanh(s * (1.0 - np.abs(x) / tr))
+        elif p == "lorentzian":
             c = self.params.get("center", 0.0)
             g = self.params.get("gamma", 1.0)
             a = self.params.get("amp", 1.0)
-            return a * g / ((r - c)**2 + g**2)
-        if p == "resonant_scalar":
-            interp = interp1d(self.r_grid, self.resonant_phi, kind='cubic', fill_value="extrapolate")
-            return float(interp(r))
-        raise ValueError(f"Unknown profile: {p}")
+            vals = a * g / ((x - c)**2 + g**2)
+        elif p == "resonant_scalar":
+            vals = self._spline(x)
+        else:
+            raise ValueError(f"Unknown profile: {p}")
+        return float(vals) if x.ndim == 0 else vals
+# ── Batched propagator engine ─────────────────────────────────────────────────
+# Every radial step of the bridge is a 2x2 generator H = a·σ, so the step
+# propagators come from the closed-form SU(2) exponential for the whole path at
+# once, and the time-ordered product is reduced pairwise in log2(N) batched
+# matmuls instead of N sequential ones.
+_TWIST_AXES = {"x": 0, "y": 1, "z": 2}
+
+def path_dt(r_path):
+    """Mean step of r_path along its last axis (1.0 for single-point paths)."""
+    r_path = np.asarray(r_path, dtype=np.float64)
+    if r_path.shape[-1] < 2:
+        return np.ones(r_path.shape[:-1])
+    return np.diff(r_path, axis=-1).mean(axis=-1)
+
+def sample_phi(phi, r_path) -> np.ndarray:
+    """Evaluate phi on every point of r_path, in one call when phi accepts arrays."""
+    r_path = np.asarray(r_path, dtype=np.float64)
+    try:
+        vals = np.asarray(phi(r_path), dtype=np.float64)
+        if vals.shape == r_path.shape:
+            return vals
+    except (TypeError, ValueError):
+        pass
+    return np.array([float(phi(r)) for r in r_path.ravel()]).reshape(r_path.shape)
+
+def su2_exp(coeffs, dt):
+    """exp(-i dt a·σ) for real coefficient vectors a of shape (..., 3), closed form.
+
+    dt broadcasts against the leading dimensions of `coeffs`.
+    """
+    a = torch.as_tensor(coeffs, dtype=torch.float64, device=device)
+    dt = torch.as_tensor(dt, dtype=torch.float64, device=device)
+    norm = torch.linalg.vector_norm(a, dim=-1)
+    theta = norm * dt
+    safe = torch.where(norm > 0, norm, torch.ones_like(norm))
+    s = torch.where(norm > 0, torch.sin(theta) / safe, dt.expand_as(norm))
+    c = torch.cos(theta)
+    ax, ay, az = a.unbind(-1)
+    U = torch.stack([
+        torch.complex(c, -s * az), torch.complex(-s * ay, -s * ax),
+        torch.complex(s * ay, -s * ax), torch.complex(c, s * az),
+    ], dim=-1)
+    return U.reshape(*U.shape[:-1], 2, 2).to(_dtype)
+
+def ordered_product(U):
+    """Time-ordered product U[..., N-1] @ ... @ U[..., 0] over the step axis -3.
+
+    Adjacent steps are multiplied pairwise (tree reduction), so the depth of
+    the product is log2(N) batched matmuls.
+    """
+    d = U.shape[-1]
+    if U.shape[-3] == 0:
+        return torch.eye(d, dtype=U.dtype, device=U.device).expand(*U.shape[:-3], d, d).clone()
+    while U.shape[-3] > 1:
+        n = U.shape[-3]
+        P = U[..., 1:n:2, :, :] @ U[..., 0:n - 1:2, :, :]
+        if n % 2:
+            P[..., -1, :, :] = U[..., -1, :, :] @ P[..., -1, :, :]
+        U = P
+    return U[..., 0, :, :]
+
+def bridge_propagator(r_paths, phi, twist_strength=0.0, twist_axis="x", dt=None):
+    """Bridge unitary for one path or a batch of paths/profiles in a single pass.
+
+    r_paths is a single path of shape (N,) or a batch of shape (B, N).  phi is
+    one profile shared by every path, or a sequence of B profiles (a single
+    path is then reused for each of them).  twist_strength may be a scalar or
+    an array of shape (B,).  Returns a (2, 2) unitary, or (B, 2, 2) for a batch.
+    """
+    r_paths = np.asarray(r_paths, dtype=np.float64)
+    profiles = list(phi) if isinstance(phi, Sequence) else None
+    single = r_paths.ndim == 1 and profiles is None
+    if profiles is not None and r_paths.ndim == 1:
+        r_paths = np.broadcast_to(r_paths, (len(profiles), r_paths.shape[0]))
+    r_paths = np.atleast_2d(r_paths)
+    if profiles is None:
+        h = sample_phi(phi, r_paths) ** 2
+    else:
+        if len(profiles) != r_paths.shape[0]:
+            raise ValueError(f"Got {len(profiles)} profiles for {r_paths.shape[0]} paths")
+        h = np.stack([sample_phi(p, rp) for p, rp in zip(profiles, r_paths)]) ** 2
+    if dt is None:
+        dt = path_dt(r_paths)
+    twist = np.asarray(twist_strength, dtype=np.float64).reshape(-1)
+    batch = h.shape[0] if twist.size == 1 else twist.size
+    if h.shape[0] not in (1, batch):
+        raise ValueError(f"Got {twist.size} twist strengths for {h.shape[0]} paths")
+    single = single and batch == 1
+    h = np.broadcast_to(h, (batch, h.shape[1]))
+    dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (batch,)).copy()
+
+    coeffs = np.zeros(h.shape + (3,))
+    coeffs[..., 2] = h
+    coeffs[..., _TWIST_AXES[twist_axis]] += twist[:, None]
+    U = ordered_product(su2_exp(coeffs, dt[:, None]))
+    return U[0] if single else U
+
 # ── Core evolution operators ───────────────────────────────────────────────────
 def radial_geodesic(rmin=0.0, rmax=1.0, nsteps=201):
     return np.linspace(rmin, rmax, nsteps)
 
 def er_bridge_unitary(r_path, phi: Callable[[float], float], dt=None):
-    if dt is None: dt = float(np.mean(np.diff(r_path))) if len(np.diff(r_path)) else 1.0
-    U = I2()
-    for r in r_path:
-        h = float(phi(r)) ** 2
-        H = torch.tensor([[h, 0.0], [0.0, -h]], dtype=_dtype, device=device)
-        U = torch.matrix_exp(-1j * H * dt) @ U
-    return U
+    return bridge_propagator(r_path, phi, dt=dt)
 
 def er_bridge_unitary_with_twist(r_path, phi, twist_strength=0.1, twist_axis="x", dt=None):
-    if dt is None: dt = float(np.mean(np.diff(r_path))) if len(np.diff(r_path)) else 1.0
-    sigma = {"x": pauli_x(), "y": pauli_y(), "z": pauli_z()}[twist_axis]
-    U = I2()
-    for r in r_path:
-        h = float(phi(r)) ** 2
-        H = torch.tensor([[h, 0.0], [0.0, -h]], dtype=_dtype, device=device) + twist_strength * sigma
-        U = torch.matrix_exp(-1j * H * dt) @ U
-    return U
+    return bridge_propagator(r_path, phi, twist_strength=twist_strength, twist_axis=twist_axis, dt=dt)
+@functools.lru_cache(maxsize=None)
+def two_qubit_generators():
+    """Constant 4x4 generators (local h(r) term per unit h, twist, SWAP-like)."""
+    X, Z = pauli_x(), pauli_z()
+    n1, sp = to_tensor([[0, 0], [0, 1]]), to_tensor([[0, 1], [0, 0]])
+    G_loc = kron(Z, I2()) - kron(I2(), Z)
+    G_twist = kron(X, I2()) + kron(I2(), X)
+    # minimal SWAP-like term
+    G_swap = kron(n1, sp) + kron(sp, n1)
+    return G_loc, G_twist, G_swap
+
+def two_qubit_propagator(h, local_twist, entangling_phase, dt):
+    """Batched two-qubit bridge unitaries.
+
+    h has shape (G, N) (squared profile along each path); local_twist,
+    entangling_phase and dt broadcast to (G,).  Returns (G, 4, 4).
+    """
+    G_loc, G_twist, G_swap = two_qubit_generators()
+    h = torch.as_tensor(h, dtype=torch.float64, device=device).to(_dtype)
+    col = lambda v: torch.as_tensor(np.asarray(v, dtype=np.float64), device=device).to(_dtype).reshape(-1, 1, 1, 1)
+    H = (h[..., None, None] * G_loc
+         + col(local_twist) * G_twist
+         + col(entangling_phase) * G_swap)
+    return ordered_product(torch.matrix_exp(-1j * col(dt) * H))
+
 def two_qubit_er_unitary(r_path, phi, local_twist=0.0, entangling_phase=0.0, dt=None):
-    if dt is None: dt = float(np.mean(np.diff(r_path))) if len(np.diff(r_path)) else 1.0
-    X = pauli_x()
-    U = I4()
-    for r in r_path:
-        h = float(phi(r)) ** 2
-        HA = torch.tensor([[h, 0.0], [0.0, -h]], dtype=_dtype, device=device)
-        Hloc = kron(HA, I2()) + kron(I2(), -HA)
-        Htwist = local_twist * (kron(X, I2()) + kron(I2(), X))
-        # minimal SWAP-like term
-        SWAP_like = entangling_phase * (
-            kron(to_tensor([[0,0],[0,1]]), to_tensor([[0,1],[0,0]])) +
-            kron(to_tensor([[0,1],[0,0]]), to_tensor([[0,0],[0,1]]))
-        )
-        H = Hloc + Htwist + SWAP_like
-        U = torch.matrix_exp(-1j * H * dt) @ U
-    return U
-EOF 
-cat >> physics/er_epr.py << 'EOF'
+    if dt is None: dt = float(path_dt(r_path))
+    h = sample_phi(phi, r_path)[None, :] ** 2
+    return two_qubit_propagator(h, local_twist, entangling_phase, dt)[0]
 # ── Diagnostics ───────────────────────────────────────────────────────────────
 def fidelity(a, b): return float(abs((a.conj().T @ b).item())**2)
 def pure_rho(psi): return psi @ psi.conj().T
-def reduced_rho(rho, sys=0):
-    r = rho.reshape(2,2,2,2)
-    return r.trace(dim1=1, dim2=3) if sys==0 else r.trace(dim1=0, dim2=2)
-def von_neumann_entropy(rho):
-    vals = torch.linalg.eigvals(rho).real.clamp(min=1e-12)
-    return float(- (vals * torch.log(vals)).sum())
+def reduced_rho(rho, sys=0): return reduced_rho_batch(rho, sys)
+def von_neumann_entropy(rho): return float(von_neumann_entropy_batch(rho))
 def concurrence(psi):
     sy = torch.tensor([[0,-1j],[1j,0]], dtype=_dtype, device=device)
     SYY = kron(sy,sy)
     return float(abs((psi.conj().T @ SYY @ psi).item()))
 
+# Batched variants: leading dimensions are batch dimensions, states are (..., d, 1).
+def fidelity_batch(a, b):
+    return ((a.conj().transpose(-2, -1) @ b)[..., 0, 0].abs() ** 2).real
+def pure_rho_batch(psi): return psi @ psi.conj().transpose(-2, -1)
+def reduced_rho_batch(rho, sys=0):
+    r = rho.reshape(*rho.shape[:-2], 2, 2, 2, 2)
+    return torch.diagonal(r, dim1=-3, dim2=-1).sum(-1) if sys == 0 else torch.diagonal(r, dim1=-4, dim2=-2).sum(-1)
+def von_neumann_entropy_batch(rho):
+    vals = torch.linalg.eigvalsh(rho).clamp(min=1e-12)
+    return -(vals * torch.log(vals)).sum(-1)
+def concurrence_batch(psi):
+    sy = pauli_y()
+    SYY = kron(sy, sy)
+    return (psi.conj().transpose(-2, -1) @ SYY @ psi)[..., 0, 0].abs()
+def state_fidelity_batch(psi, rho):
+    return (psi.conj().transpose(-2, -1) @ rho @ psi)[..., 0, 0].real
+def purity_batch(rho):
+    return (rho @ rho).diagonal(dim1=-2, dim2=-1).sum(-1).real
+
+# ── Parameter sweeps ──────────────────────────────────────────────────────────
+def two_qubit_sweep(r_path, profiles, local_twists, entangling_phases, psi0=None, dt=None, chunk_size=4096):
+    """Two-qubit bridge over the grid profiles × local_twists × entangling_phases.
+
+    profiles is one phi callable or a sequence of them.  The generators are
+    built once, every grid point's path is exponentiated and reduced in one
+    batched pass (in chunks of `chunk_size` grid points), and the diagnostics
+    are evaluated on the whole batch.  psi0 defaults to the Bell state.
+
+    Returns a dict with "unitaries" of shape (P, T, E, 4, 4) and "fidelity",
+    "entropy" (of the reduced state of qubit A) and "concurrence" of shape
+    (P, T, E), plus the grid axes.
+    """
+    profiles = list(profiles) if isinstance(profiles, Sequence) else [profiles]
+    twists = np.atleast_1d(np.asarray(local_twists, dtype=np.float64))
+    phases = np.atleast_1d(np.asarray(entangling_phases, dtype=np.float64))
+    if dt is None: dt = float(path_dt(r_path))
+    if psi0 is None:
+        psi0 = bell_state()
+
+    h = np.stack([sample_phi(p, r_path) for p in profiles]) ** 2
+    P, T_, E_ = len(profiles), len(twists), len(phases)
+    pi, ti, ei = (idx.ravel() for idx in np.meshgrid(np.arange(P), np.arange(T_), np.arange(E_), indexing="ij"))
+    U = torch.cat([
+        two_qubit_propagator(h[pi[s:s + chunk_size]], twists[ti[s:s + chunk_size]], phases[ei[s:s + chunk_size]], dt)
+        for s in range(0, len(pi), chunk_size)
+    ])
+
+    final = U @ psi0
+    rho_red = reduced_rho_batch(pure_rho_batch(final))
+    shape = (P, T_, E_)
+    return {
+        "unitaries": U.reshape(*shape, 4, 4),
+        "fidelity": fidelity_batch(psi0, final).reshape(shape),
+        "entropy": von_neumann_entropy_batch(rho_red).reshape(shape),
+        "concurrence": concurrence_batch(final).reshape(shape),
+        "local_twist": twists,
+        "entangling_phase": phases,
+    }
+
+# ── Open-system (Lindblad) evolution ──────────────────────────────────────────
+# Density matrices are vectorised row-major, vec(A ρ B) = (A ⊗ Bᵀ) vec(ρ).
+# Each radial step is Strang-split into noise(dt/2) · U(dt) · noise(dt/2):
+# the unitary superoperators U ⊗ U* are shared by every noise rate, and the
+# dephasing + amplitude-damping channels are phase covariant, so they commute
+# and have a closed form in the integrated rates.  Adjacent noise halves merge
+# into one channel, and the whole path reduces with ordered_product.
+def batch_kron(A, B):
+    """Kronecker product over the last two dims with broadcast batch dims."""
+    out = A[..., :, None, :, None] * B[..., None, :, None, :]
+    return out.reshape(*out.shape[:-4], A.shape[-2] * B.shape[-2], A.shape[-1] * B.shape[-1])
+
+def unitary_superoperator(U):
+    """vec(U ρ U†) = (U ⊗ U*) vec(ρ); also right for the non-Hermitian SWAP-like term."""
+    return batch_kron(U, U.conj())
+
+def noise_channel(dephasing, damping, n_qubits=1):
+    """Superoperator of dephasing (L = √(γφ/2) Z) and amplitude damping (L = √γ1 σ-).
+
+    dephasing and damping are the integrated rates γφ·t and γ1·t (any equal
+    batch shape), applied to every qubit.  Returns (..., d², d²).
+    """
+    dephasing = torch.as_tensor(dephasing, dtype=torch.float64, device=device)
+    damping = torch.as_tensor(damping, dtype=torch.float64, device=device)
+    keep = torch.exp(-damping)
+    coherence = torch.exp(-0.5 * damping - dephasing)
+    E = torch.zeros(*keep.shape, 4, 4, dtype=torch.float64, device=device)
+    E[..., 0, 0] = 1.0
+    E[..., 0, 3] = 1.0 - keep
+    E[..., 1, 1] = E[..., 2, 2] = coherence
+    E[..., 3, 3] = keep
+    E = E.to(_dtype)
+    if n_qubits == 1:
+        return E
+    if n_qubits == 2:
+        e = E.reshape(*E.shape[:-2], 2, 2, 2, 2)
+        return torch.einsum("...abcd,...efgh->...aebfcgdh", e, e).reshape(*E.shape[:-2], 16, 16)
+    raise ValueError("Lindblad mode supports 1 or 2 qubits; use physics.er_chain for chains")
+
+def bridge_step_unitaries(h, n_qubits=1, local_twist=0.0, entangling_phase=0.0, twist_axis="x", dt=1.0):
+    """Per-step bridge propagators (N, d, d) for the squared profile h of shape (N,)."""
+    h = np.asarray(h, dtype=np.float64)
+    if n_qubits == 1:
+        coeffs = np.zeros(h.shape + (3,))
+        coeffs[..., 2] = h
+        coeffs[..., _TWIST_AXES[twist_axis]] += local_twist
+        return su2_exp(coeffs, dt)
+    if n_qubits == 2:
+        G_loc, G_twist, G_swap = two_qubit_generators()
+        H = torch.as_tensor(h, device=device).to(_dtype)[:, None, None] * G_loc + local_twist * G_twist + entangling_phase * G_swap
+        return torch.matrix_exp(-1j * dt * H)
+    raise ValueError("Lindblad mode supports 1 or 2 qubits; use physics.er_chain for chains")
+
+def lindblad_bridge_evolve(r_path, phi, rho0, dephasing_rates=0.0, damping_rates=0.0, n_qubits=1,
+                           local_twist=0.0, entangling_phase=0.0, twist_axis="x", rate_profile=None,
+                           dt=None, chunk_size=64):
+    """Evolve a batch of initial states through the noisy bridge for a batch of rates.
+
+    rho0 is a density matrix (d, d), a batch (B, d, d), or pure states
+    (B, d, 1).  dephasing_rates and damping_rates broadcast to (K,); with
+    rate_profile(r) the rates are scaled pointwise along the path.  The path
+    superoperator of each rate pair is built once (in chunks of `chunk_size`
+    rate pairs) and applied to all B states.  Returns ρ of shape (K, B, d, d).
+    """
+    if dt is None: dt = float(path_dt(r_path))
+    d = 2 ** n_qubits
+    rho0 = torch.as_tensor(rho0, device=device).to(_dtype)
+    if rho0.shape[-1] == 1:
+        rho0 = pure_rho_batch(rho0)
+    rho0 = rho0.reshape(-1, d, d)
+
+    gamma_phi, gamma_amp = np.broadcast_arrays(np.atleast_1d(np.asarray(dephasing_rates, dtype=np.float64)),
+                                               np.atleast_1d(np.asarray(damping_rates, dtype=np.float64)))
+    scale = np.ones(len(r_path)) if rate_profile is None else sample_phi(rate_profile, r_path)
+    # exposure of each noise slot: first half step, merged halves, last half step
+    exposure = 0.5 * dt * (np.concatenate([scale, [0.0]]) + np.concatenate([[0.0], scale]))
+
+    S = unitary_superoperator(bridge_step_unitaries(sample_phi(phi, r_path) ** 2, n_qubits, local_twist,
+                                                    entangling_phase, twist_axis, dt))
+    vec0 = rho0.reshape(-1, d * d).T
+    out = []
+    for s in range(0, len(gamma_phi), chunk_size):
+        E = noise_channel(np.outer(gamma_phi[s:s + chunk_size], exposure),
+                          np.outer(gamma_amp[s:s + chunk_size], exposure), n_qubits)
+        path = E[:, -1] @ ordered_product(S @ E[:, :-1])
+        out.append((path @ vec0).transpose(-2, -1))
+    return torch.cat(out).reshape(len(gamma_phi), rho0.shape[0], d, d)
 
 def plot_bloch(psi, title="Bloch sphere"):
     a, b = psi[:,0]
@@ -150,7 +434,7 @@ def demo_epr():
     r = radial_geodesic(0.0, 1.0, 201)
     phi = PhiFieldInterpolator(profile="resonant_scalar")
     U = two_qubit_er_unitary(r, phi, local_twist=0.08, entangling_phase=0.025)
-    bell = (kron(ket0(), ket0()) + kron(ket1(), ket1())) / math.sqrt(2)
+    bell = bell_state()
     final = U @ bell
     rho_red = reduced_rho(pure_rho(final))
     print(f"Fidelity: {fidelity(bell, final):.7f}")
@@ -161,55 +445,3 @@ if __name__ == "__main__":
     print(f"Device: {device}")
     demo_single()
     demo_epr()
-import math, numpy as np, torch, matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from scipy.interpolate import interp1d
-
-_dtype = torch.complex64
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-T = lambda x: torch.tensor(x, dtype=_dtype, device=device)
-ket0, ket1 = T([[1],[0]]), T([[0],[1]])
-X = T([[0,1],[1,0]])
-I2 = lambda: torch.eye(2, dtype=_dtype, device=device)
-I4 = lambda: torch.eye(4, dtype=_dtype, device=device)
-kron = torch.kron
-
-class PhiFieldInterpolator:
-    def __init__(self, profile="resonant_scalar"):
-        self.profile = profile
-        if profile == "resonant_scalar":
-            from resonant_scalar_increase import build_initial_phi, sovariel_recursion
-            Phi0 = build_initial_phi()
-            Phi, _ = sovariel_recursion(Phi0)
-            self.phi_r = Phi[Phi.shape[0]//2, :]
-            self.r = np.linspace(0, 1, len(self.phi_r))
-
-    def __call__(self, r):
-        f = interp1d(self.r, self.phi_r, kind='cubic', fill_value="extrapolate")
-        return float(f(r))
-
-def evolve(r_path, phi):
-    dt = np.mean(np.diff(r_path))
-    U = I2()
-    for r in r_path:
-        h = phi(r)**2
-        H = T([[h,0],[0,-h]]) + 0.15*X
-        U = torch.matrix_exp(-1j*H*dt) @ U
-    return U
-
-def plot_bloch(psi):
-    a,b = psi[:,0]
-    x,y,z = 2*(a*b.conj()).real.item(), 2*(a*b.conj()).imag.item(), (abs(a)**2-abs(b)**2).item()
-    fig = plt.figure(); ax = fig.add_subplot(111, projection='3d')
-    ax.quiver(0,0,0,x,y,z,color='red',length=1,normalize=True)
-    u,v = np.mgrid[0:2*np.pi:30j, 0:np.pi:20j]
-    ax.plot_wireframe(np.sin(v)*np.cos(u), np.sin(v)*np.sin(u), np.cos(v), color="gray", alpha=0.1)
-    plt.show()
-
-if __name__ == "__main__":
-    r = np.linspace(0, 1, 401)
-    phi = PhiFieldInterpolator()
-    plus = (ket0 + ket1)/math.sqrt(2)
-    final = evolve(r, phi) @ plus
-    print(f"Single-qubit fidelity: {(abs((plus.conj().T @ final))**2):.7f}")
-    plot_bloch(final)
@@ -0,0 +1,226 @@
+"""
+resonant_scalar_3d.py
+
+Full 3D (non-axisymmetric) resonant scalar field + Sovariel recursion.
+
+Generalises resonant_scalar_increase.py from Y_l0 on an (θ, r) grid to real
+Y_l^m modes on a spherical (θ, r, φ) lattice, so tilted and asymmetric coil
+geometries can be solved.  The azimuthal dependence is handled with a real
+FFT along φ: every φ-mode m is an independent (θ, r) problem with its own
+precomputed associated Legendre table.  Derivatives are spectral in φ only;
+in r and θ they are second-order finite differences, as in the 2D code.
+"""
+
+from functools import cached_property
+
+import numpy as np
+import resonant_scalar_increase as rsi
+from legendre_basis import legendre_basis, legendre_recurrence, sph_norm
+
+# ---------- User parameters ----------
+a = rsi.a
+Nr = 64                    # radial grid points
+Ntheta = 96                # polar grid points (cell-centred, poles excluded)
+Nphi = 64                  # azimuthal grid points (periodic)
+l_modes = rsi.l_modes
+m_max = None               # largest |m| kept per l (None = all 2l+1 modes)
+tilt = 0.0                 # tilt of the 3-6-9 axis from +z (radians)
+# -------------------------------------
+
+# Normalisation of real Y_lm = N P_l^|m| cos/sin(mφ): unit norm on the sphere,
+# the √2 of real harmonics included for m ≠ 0.
+def real_sph_norm(l, m):
+    return sph_norm(l, m) * (np.sqrt(2.0) if m else 1.0)
+
+class SphericalGrid3D:
+    """(θ, r, φ) lattice with per-m Legendre/radial tables for the (l, m) basis.
+
+    Fields are arrays of shape (Ntheta, Nr, Nphi); φ is last so the real FFT
+    runs along the contiguous axis.  Mode (l, m) is P_l^|m|(θ) R_l(r) times
+    cos(mφ) for m ≥ 0 and sin(|m|φ) for m < 0.
+    """
+
+    def __init__(self, Nr=Nr, Ntheta=Ntheta, Nphi=Nphi, l_modes=l_modes, m_max=m_max, a=a):
+        self.Nr = int(Nr)
+        self.Ntheta = int(Ntheta)
+        self.Nphi = int(Nphi)
+        self.l_modes = tuple(int(l) for l in l_modes)
+        self.a = float(a)
+        top = self.Nphi // 2 - 1
+        self.modes = tuple((l, m) for l in self.l_modes for m in range(-l, l + 1)
+                           if abs(m) <= min(l if m_max is None else m_max, top))
+
+    def __repr__(self):
+        return f"SphericalGrid3D(Nr={self.Nr}, Ntheta={self.Ntheta}, Nphi={self.Nphi}, modes={len(self.modes)})"
+
+    # Grids
+    @cached_property
+    def r(self):
+        return np.linspace(1e-6, self.a, self.Nr)
+
+    @cached_property
+    def theta(self):
+        return (np.arange(self.Ntheta) + 0.5) * np.pi / self.Ntheta
+
+    @cached_property
+    def phi(self):
+        return 2 * np.pi * np.arange(self.Nphi) / self.Nphi
+
+    @property
+    def dr(self):
+        return self.r[1] - self.r[0]
+
+    @property
+    def dth(self):
+        return self.theta[1] - self.theta[0]
+
+    @property
+    def dphi(self):
+        return 2 * np.pi / self.Nphi
+
+    @cached_property
+    def dA(self):
+        """(θ, r) volume element r² sinθ dr dθ; dV = dA dφ."""
+        return np.outer(np.sin(self.theta), self.r**2) * self.dr * self.dth
+
+    @cached_property
+    def ms(self):
+        """Azimuthal orders present in the basis."""
+        return sorted({abs(m) for _, m in self.modes})
+
+    # Per-m tables: mode indices and their (k, Ntheta, Nr) P_l^|m| R_l products
+    @cached_property
+    def tables(self):
+        cost = np.cos(self.theta)
+        L = max(self.l_modes)
+        tabs = {}
+        for m in self.ms:
+            P = legendre_basis(cost, L, m, key=("theta3d", self.Ntheta))
+            cos_idx = [i for i, (l, mm) in enumerate(self.modes) if mm == m]
+            sin_idx = [i for i, (l, mm) in enumerate(self.modes) if mm == -m and m]
+            ls = [self.modes[i][0] for i in cos_idx]
+            T = np.array([real_sph_norm(l, m) * P[l][:, None] * rsi.radial_profile(l, self.r, self.a)[None, :] for l in ls])
+            tabs[m] = (cos_idx, sin_idx, T.reshape(len(ls), -1))
+        return tabs
+
+    @cached_property
+    def norm_vector(self):
+        # Σ_k cos²(mφ_k) = Nphi/2 for 0 < m < Nphi/2, Nphi for m = 0
+        norm = np.empty(len(self.modes))
+        for m, (cos_idx, sin_idx, T) in self.tables.items():
+            n = (T**2) @ self.dA.ravel() * self.dphi * (self.Nphi if m == 0 else self.Nphi / 2)
+            norm[cos_idx] = n
+            if sin_idx:
+                norm[sin_idx] = n
+        return norm
+
+    def project(self, Phi):
+        """Coefficients of Φ on self.modes."""
+        Fh = np.fft.rfft(Phi, axis=-1)
+        w = self.dA.ravel() * self.dphi
+        c = np.empty(len(self.modes))
+        for m, (cos_idx, sin_idx, T) in self.tables.items():
+            s = T @ (Fh[..., m].ravel() * w)
+            c[cos_idx] = s.real
+            if sin_idx:
+                c[sin_idx] = -s.imag
+        return c / self.norm_vector
+
+    def reconstruct(self, coeffs):
+        """Field Σ c_lm Y_lm(θ, φ) R_l(r) for coefficients ordered as self.modes."""
+        Fh = np.zeros((self.Ntheta, self.Nr, self.Nphi // 2 + 1), dtype=complex)
+        for m, (cos_idx, sin_idx, T) in self.tables.items():
+            spec = coeffs[cos_idx] @ T
+            if sin_idx:
+                spec = spec - 1j * (coeffs[sin_idx] @ T)
+            Fh[..., m] = spec.reshape(self.Ntheta, self.Nr) * (self.Nphi if m == 0 else self.Nphi / 2)
+        return np.fft.irfft(Fh, n=self.Nphi, axis=-1)
+
+    # Operators are spectral in φ only: every rfft mode is an independent (θ, r)
+    # slice, differenced along r and θ for all m at once
+    def laplacian(self, Phi):
+        """∇²Φ: second-order finite differences in r and θ, exact -m²/(r² sin²θ) in φ.
+
+        So the operator is only spectrally accurate in φ; the r and θ error is
+        that of np.gradient on the (θ, r) grid, as in resonant_scalar_increase.
+        """
+        R2 = self.r[None, :, None]**2
+        sinth = np.sin(self.theta)[:, None, None]
+        m = np.arange(self.Nphi // 2 + 1)
+        F = np.fft.rfft(Phi, axis=-1)
+        term_r = np.gradient(R2 * np.gradient(F, self.dr, axis=1), self.dr, axis=1) / (R2 + 1e-15)
+        term_th = np.gradient(sinth * np.gradient(F, self.dth, axis=0), self.dth, axis=0) / (R2 * sinth + 1e-15)
+        return np.fft.irfft(term_r + term_th - m**2 * F / (R2 * sinth**2 + 1e-15), n=self.Nphi, axis=-1)
+
+    def gradient(self, Phi):
+        """(∂Φ/∂r, ∂Φ/∂θ, ∂Φ/∂φ), the φ-derivative taken spectrally."""
+        m = np.arange(self.Nphi // 2 + 1)
+        d_phi = np.fft.irfft(1j * m * np.fft.rfft(Phi, axis=-1), n=self.Nphi, axis=-1)
+        return np.gradient(Phi, self.dr, axis=1), np.gradient(Phi, self.dth, axis=0), d_phi
+
+def build_initial_phi(grid, tilt=tilt, amps=None):
+    """3-6-9 trap potential ×3.69, axisymmetric about an axis tilted by `tilt` in the x-z plane.
+
+    amps optionally maps (l, m) to an amplitude and replaces the tilted field.
+    """
+    g = grid
+    if amps is not None:
+        return -np.abs(g.reconstruct(np.array([amps.get(mode, 0.0) for mode in g.modes])))
+    th, ph = g.theta[:, None], g.phi[None, :]
+    cos_tilted = np.cos(th) * np.cos(tilt) - np.sin(th) * np.cos(ph) * np.sin(tilt)
+    P = legendre_recurrence(max(g.l_modes), cos_tilted)
+    Phi = np.zeros((g.Ntheta, g.Nr, g.Nphi))
+    for l in g.l_modes:
+        amp = rsi.A_base * rsi.scale_factor * rsi.amp_ratios[l]
+        Phi += amp * sph_norm(l) * P[l][:, None, :] * rsi.radial_profile(l, g.r, g.a)[None, :, None]
+    return -np.abs(Phi)
+
+def project_and_coherence(Phi, grid):
+    c = grid.project(Phi)
+    total_E = np.sum(Phi**2 * grid.dA[..., None]) * grid.dphi
+    coherence = np.sum(c*c * grid.norm_vector) / (total_E + 1e-20)
+    return dict(zip(grid.modes, c)), coherence
+
+def dyadic_update(Phi, grid):
+    """The dyadic kick of resonant_scalar_increase with the φ-term added."""
+    rho = -8.8541878128e-12 * grid.laplacian(Phi)
+    D = sum(gp * gr for gp, gr in zip(grid.gradient(Phi), grid.gradient(rho)))
+    D /= (np.max(np.abs(D)) + 1e-20)
+    return D
+
+def sovariel_recursion(Phi0, grid, n_iter=None, tol=rsi._DEFAULT, ctol=rsi._DEFAULT, accelerate=None, verbose=True):
+    """3D Φ ← -|P(Φ + λ·D(Φ))|, stopping/acceleration as in the 2D recursion.
+
+    Returns (Φ, history); history entries are keyed by (l, m).
+    """
+    g = grid
+    if n_iter is None:
+        n_iter = rsi.n_iter
+    tol, ctol = rsi._tolerances(tol, ctol)
+
+    def full_step(Phi):
+        coeffs, coh = project_and_coherence(Phi, g)
+        c = np.fromiter(coeffs.values(), dtype=float)
+        return c, coh, c + rsi.lambda_step * g.project(dyadic_update(Phi, g))
+
+    def report(it, coh, c):
+        if verbose and (it % 5 == 0 or it == 1):
+            c = history.coeffs[it - 1]          # projected coefficients of this iterate, not the next raw c
+            top = np.argsort(-np.abs(c))[:3]
+            print(f"Iter {it:03d} | Coherence = {coh:.9f} | " + "  ".join(f"{g.modes[i]}:{c[i]:.4f}" for i in top))
+
+    history = rsi.RecursionHistory(n_iter, g.modes)
+    c, history = rsi._iterate(lambda: full_step(Phi0), lambda c: full_step(-np.abs(g.reconstruct(c))),
+                              g.modes, n_iter, tol, ctol, accelerate, False, report, history)
+    return (Phi0 if c is None else -np.abs(g.reconstruct(c))), history
+
+# ============================== MAIN ==============================
+if __name__ == "__main__":
+    grid = SphericalGrid3D()
+    print(f"Building tilted 3-6-9 field on {grid} (tilt {tilt:.3f} rad)...")
+    Phi0 = build_initial_phi(grid)
+    _, coh0 = project_and_coherence(Phi0, grid)
+    print(f"Initial coherence: {coh0:.9f}")
+    Phi_final, history = sovariel_recursion(Phi0, grid)
+    _, final_coh = project_and_coherence(Phi_final, grid)
+    print(f"\nFINAL COHERENCE: {final_coh:.12f}  ({len(history)} iterations)")
@@ -12,8 +12,11 @@ Author: You + Grok
 Date: 2025
 """
 
+import os
+from functools import cached_property
+
 import numpy as np
-from scipy.special import lpmv
+from legendre_basis import legendre_basis, legendre_recurrence, sph_norm
 import matplotlib.pyplot as plt
 from matplotlib.colors import Normalize
 
@@ -26,47 +29,166 @@ A_base = 1.0
 scale_factor = 3.69        # The magic number
 amp_ratios = {3: 1.0, 6: 2/3, 9: 1/3}
 lambda_step = 0.22         # Slightly higher = faster convergence
-n_iter = 70
+n_iter = 70                # iteration cap
+coherence_tol = 1e-12      # stop once |Δcoherence| and max|Δcoeff| fall below these
+coeff_tol = 1e-10
 plot_every = 10            # 0 to disable live plots
+cache_dir = os.environ.get("AGAPE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "agape"))
 # -------------------------------------
 
-# Grids
-r = np.linspace(1e-6, a, Nr)
-theta = np.linspace(0, np.pi, Ntheta)
-R, TH = np.meshgrid(r, theta, indexing='xy')
-X = R * np.sin(TH)
-Z = R * np.cos(TH)
-
-# Pre-compute volume element
-dr = r[1] - r[0]
-dth = theta[1] - theta[0]
-dV = 2 * np.pi * R**2 * np.sin(TH) * dr * dth
-
 # Spherical harmonic Y_l^0 (real, normalized)
 def Y_l0(l, costheta):
-    P = lpmv(0, l, costheta)
-    norm = np.sqrt((2*l + 1) / (4 * np.pi))
-    return norm * P
+    return sph_norm(l) * legendre_recurrence(l, costheta)[l]
+
+# All Y_l0 for l in l_modes at once, from one (cached) recurrence pass
+def Y_l0_table(l_modes, costheta, key=None):
+    l_modes = list(l_modes)
+    P = legendre_basis(costheta, max(l_modes), key=key)
+    return np.array([sph_norm(l) * P[l] for l in l_modes])
 
 # Radial mode (zero at boundaries)
-def radial_profile(l, rr):
+def radial_profile(l, rr, a=a):
     return np.sin(l * np.pi * rr / a)
 
-# Pre-compute all basis functions and their norms (huge speedup)
-basis_funcs = {}
-basis_norms = {}
-cost = np.cos(TH)
-for l in l_modes:
-    Y = Y_l0(l, cost)[:, np.newaxis]
-    Rrad = radial_profile(l, R).T
-    basis = Y * Rrad
-    basis_funcs[l] = basis
-    basis_norms[l] = np.sum(basis**2 * dV)
+# Grids + pre-computed basis, built on first use and shared per resolution
+class ResonantScalarGrid:
+    """(θ, r) lattice with its volume element and l-mode basis.
+
+    Nothing is allocated until an attribute is first read.  Instances are
+    shared per (Nr, Ntheta, l_modes, a) through `ResonantScalarGrid.get`, and
+    the basis/dV arrays are persisted to an .npz under `cache_dir` so a new
+    process only loads them.
+    """
+    _instances = {}
+
+    def __init__(self, Nr=Nr, Ntheta=Ntheta, l_modes=l_modes, a=a, cache_dir=cache_dir):
+        self.Nr = int(Nr)
+        self.Ntheta = int(Ntheta)
+        self.l_modes = tuple(int(l) for l in l_modes)
+        self.a = float(a)
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def get(cls, Nr=Nr, Ntheta=Ntheta, l_modes=l_modes, a=a, cache_dir=cache_dir):
+        key = (int(Nr), int(Ntheta), tuple(int(l) for l in l_modes), float(a))
+        if key not in cls._instances:
+            cls._instances[key] = cls(Nr, Ntheta, l_modes, a, cache_dir)
+        return cls._instances[key]
+
+    def __repr__(self):
+        return f"ResonantScalarGrid(Nr={self.Nr}, Ntheta={self.Ntheta}, l_modes={list(self.l_modes)}, a={self.a})"
+
+    # Grids
+    @cached_property
+    def r(self):
+        return np.linspace(1e-6, self.a, self.Nr)
+
+    @cached_property
+    def theta(self):
+        return np.linspace(0, np.pi, self.Ntheta)
+
+    @cached_property
+    def R(self):
+        return np.broadcast_to(self.r[np.newaxis, :], (self.Ntheta, self.Nr))
+
+    @cached_property
+    def TH(self):
+        return np.broadcast_to(self.theta[:, np.newaxis], (self.Ntheta, self.Nr))
+
+    @cached_property
+    def X(self):
+        return self.R * np.sin(self.TH)
+
+    @cached_property
+    def Z(self):
+        return self.R * np.cos(self.TH)
+
+    @property
+    def dr(self):
+        return self.r[1] - self.r[0]
+
+    @property
+    def dth(self):
+        return self.theta[1] - self.theta[0]
+
+    # Pre-compute volume element and all basis functions and their norms (huge speedup)
+    @property
+    def cache_path(self):
+        modes = "-".join(str(l) for l in self.l_modes)
+        return os.path.join(self.cache_dir, f"grid_{self.Ntheta}x{self.Nr}_a{self.a:g}_l{modes}.npz")
+
+    @cached_property
+    def _arrays(self):
+        path = self.cache_path if self.cache_dir else None
+        if path and os.path.exists(path):
+            with np.load(path) as cached:
+                if "basis" in cached.files:
+                    return {k: cached[k] for k in cached.files}
+        arrays = {"dV": 2 * np.pi * self.R**2 * np.sin(self.TH) * self.dr * self.dth}
+        Y = Y_l0_table(self.l_modes, np.cos(self.theta), key=("theta", self.Ntheta))
+        basis = np.empty((len(self.l_modes), self.Ntheta, self.Nr))
+        for i, l in enumerate(self.l_modes):
+            basis[i] = Y[i][:, np.newaxis] * radial_profile(l, self.r, self.a)[np.newaxis, :]
+        arrays["basis"] = basis.reshape(len(self.l_modes), -1)
+        if path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp, **arrays)
+            os.replace(tmp, path)
+        return arrays
+
+    @cached_property
+    def dV(self):
+        return self._arrays["dV"]
+
+    # Stacked basis: row i is basis l_modes[i] flattened over the (θ, r) grid
+    @cached_property
+    def basis_matrix(self):
+        return self._arrays["basis"]
+
+    @cached_property
+    def norm_vector(self):
+        return (self.basis_matrix**2) @ self.dV.ravel()
+
+    # dV-weighted, norm-scaled basis: coefficients are one matmul, W @ Φ.ravel()
+    @cached_property
+    def projection_matrix(self):
+        return self.basis_matrix * (self.dV.ravel() / self.norm_vector[:, np.newaxis])
+
+    @cached_property
+    def basis_funcs(self):
+        return {l: self.basis_matrix[i].reshape(self.Ntheta, self.Nr) for i, l in enumerate(self.l_modes)}
+
+    @cached_property
+    def basis_norms(self):
+        return dict(zip(self.l_modes, self.norm_vector))
+
+    def project(self, Phi):
+        """Modal coefficients of Φ, ordered as l_modes."""
+        return self.projection_matrix @ Phi.ravel()
+
+    def reconstruct(self, coeffs):
+        """Field Σ_l c_l basis_l for a coefficient vector ordered as l_modes."""
+        return (coeffs @ self.basis_matrix).reshape(self.Ntheta, self.Nr)
+
+def default_grid():
+    """Grid for the module-level Nr / Ntheta / l_modes / a parameters."""
+    return ResonantScalarGrid.get(Nr, Ntheta, l_modes, a)
+
+_GRID_ATTRS = ("r", "theta", "R", "TH", "X", "Z", "dr", "dth", "dV", "basis_funcs", "basis_norms")
+
+def __getattr__(name):
+    # Module-level grid names (r, dV, basis_funcs, ...) resolve lazily to the default grid.
+    if name in _GRID_ATTRS:
+        return getattr(default_grid(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Correct axisymmetric Laplacian in spherical coordinates
-def laplacian_spherical(Phi):
+def laplacian_spherical(Phi, grid=None):
+    g = grid or default_grid()
+    R, dr, dth = g.R, g.dr, g.dth
     dPhi_dr = np.gradient(Phi, dr, axis=1)
-    dPhi_dth = np.gradient(Phi, dth maj=axis=0)
+    dPhi_dth = np.gradient(Phi, dth, axis=0)
 
     # Radial part: (1/r²) ∂/∂r (r² ∂Φ/∂r)
     r2_dPhi_dr = R**2 * dPhi_dr
@@ -74,72 +196,191 @@ def laplacian_spherical(Phi):
     term_r = d_dr_term / (R**2 + 1e-15)
 
     # Angular part: (1/(r² sinθ)) ∂/∂θ (sinθ ∂Φ/∂θ)
-    sinth = np.sin(TH) + 1e-15
+    sinth = np.sin(g.TH) + 1e-15
     sin_dPhi = sinth * dPhi_dth
     d_th_term = np.gradient(sin_dPhi, dth, axis=0)
     term_th = d_th_term / (R**2 * sinth + 1e-15)
 
     return term_r + term_th
 
+# Initial mode amplitudes A_base·scale_factor·amp_ratios[l]; the module
+# parameters are the defaults, so sweeps can pass their own values
+def initial_amplitudes(l_modes=None, A_base=None, scale_factor=None, amp_ratios=None):
+    p = globals()
+    l_modes = p["l_modes"] if l_modes is None else l_modes
+    A = p["A_base"] if A_base is None else A_base
+    s = p["scale_factor"] if scale_factor is None else scale_factor
+    ratios = p["amp_ratios"] if amp_ratios is None else amp_ratios
+    return np.array([A * s * ratios[l] for l in l_modes])
+
 # Build initial potential
-def build_initial_phi():
-    Phi = np.zeros_like(R)
-    for l in l_modes:
-        A_l = A_base * scale_factor * amp_ratios[l]
-        Phi += A_l * basis_funcs[l]
-    return -np.abs(Phi)  # Trap polarity
-
-# Modal projection (now blazing fast)
-def project_and_coherence(Phi):
-    coeffs = {}
-    energy = {}
-    total_E = np.sum(Phi**2 * dV)
-    for l in l_modes:
-        c = np.sum(Phi * basis_funcs[l] * dV) / basis_norms[l]
-        coeffs[l] = c
-        energy[l] = c*c * basis_norms[l]
-    coherence = sum(energy.values()) / (total_E + 1e-20)
-    return coeffs, coherence
+def build_initial_phi(grid=None, amps=None):
+    g = grid or default_grid()
+    amps = initial_amplitudes(g.l_modes) if amps is None else np.asarray(amps, dtype=float)
+    return -np.abs(g.reconstruct(amps))  # Trap polarity
+
+# Modal projection: one GEMM against the stacked dV-weighted basis
+def project_and_coherence(Phi, grid=None):
+    g = grid or default_grid()
+    c = g.project(Phi)
+    total_E = (Phi.ravel()**2) @ g.dV.ravel()
+    coherence = np.sum(c*c * g.norm_vector) / (total_E + 1e-20)
+    return dict(zip(g.l_modes, c)), coherence
 
 # Dyadic kick (nonlinear feedback term)
-def dyadic_update(Phi):
-    Lap = laplacian_spherical(Phi)
+def dyadic_update(Phi, grid=None):
+    g = grid or default_grid()
+    Lap = laplacian_spherical(Phi, g)
     rho = -8.8541878128e-12 * Lap
-    grad_rho_r = np.gradient(rho, dr, axis=1)
-    grad_rho_th = np.gradient(rho, dth, axis=0)
-    grad_Phi_r = np.gradient(Phi, dr, axis=1)
-    grad_Phi_th = np.gradient(Phi, dth, axis=0)
+    grad_rho_r = np.gradient(rho, g.dr, axis=1)
+    grad_rho_th = np.gradient(rho, g.dth, axis=0)
+    grad_Phi_r = np.gradient(Phi, g.dr, axis=1)
+    grad_Phi_th = np.gradient(Phi, g.dth, axis=0)
     D = grad_Phi_r * grad_rho_r + grad_Phi_th * grad_rho_th
     D /= (np.max(np.abs(D)) + 1e-20)
     return D
 
-# Sovariel recursion v2
-def sovariel_recursion(Phi0):
-    Phi = Phi0.copy()
-    history = []
+# Compact, preallocated recursion history
+class RecursionHistory:
+    """Per-iteration coherence and coefficients in preallocated arrays.
+
+    Indexing returns the legacy (iteration, coherence, {l: coeff}) tuples.
+    """
+
+    def __init__(self, n_iter, l_modes, track_discrepancy=False):
+        self.l_modes = tuple(l_modes)
+        self.coherence = np.full(n_iter, np.nan)
+        self.coeffs = np.full((n_iter, len(self.l_modes)), np.nan)
+        self.discrepancy = np.full(n_iter, np.nan) if track_discrepancy else None
+        self.n = 0
+        self.converged = False
+        self.state = None          # final raw coefficient vector c, Φ = -|B c|
+
+    def record(self, coherence, coeffs):
+        self.coherence[self.n] = coherence
+        self.coeffs[self.n] = coeffs
+        self.n += 1
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        i = range(self.n)[i]
+        return i + 1, self.coherence[i], dict(zip(self.l_modes, self.coeffs[i]))
+
+    def __iter__(self):
+        return (self[i] for i in range(self.n))
+
+# Fixed-point accelerators on the raw coefficient vector c ↦ G(c)
+class _Anderson:
+    def __init__(self, depth=5):
+        self.depth = depth
+        self.x = self.f = self.g = None
+        self.dF, self.dG = [], []
+
+    def __call__(self, x, g):
+        f = g - x
+        if self.f is not None:
+            self.dF.append(f - self.f)
+            self.dG.append(g - self.g)
+            del self.dF[:-self.depth], self.dG[:-self.depth]
+        self.f, self.g = f, g
+        if not self.dF:
+            return g
+        dF, dG = np.array(self.dF).T, np.array(self.dG).T
+        gamma = np.linalg.lstsq(dF, f, rcond=None)[0]
+        return g - dG @ gamma
+
+class _Aitken:
+    def __init__(self):
+        self.seq = []
+
+    def __call__(self, x, g):
+        self.seq = (self.seq or [x]) + [g]
+        if len(self.seq) < 3:
+            return g
+        x0, x1, x2 = self.seq
+        self.seq = []
+        denom = x2 - 2 * x1 + x0
+        safe = np.abs(denom) > 1e-14 * (np.abs(x2) + 1e-30)
+        return np.where(safe, x2 - (x2 - x1)**2 / np.where(safe, denom, 1.0), x2)
+
+def _iterate(first, step, l_modes, n_iter, tol, ctol, accelerate, verbose, after_step=None, history=None):
+    """Drive a coefficient-space fixed-point iteration.
+
+    first() and step(c) return (coefficients, coherence, next raw coefficients).
+    Stops once both the coherence change and the max coefficient change drop
+    below tol / ctol (None disables the check).  Returns (c, history).
+    """
+    if history is None:
+        history = RecursionHistory(n_iter, l_modes)
+    accel = {None: None, "anderson": _Anderson(), "aitken": _Aitken()}[accelerate]
+    c = None
+    coh_prev = None
     for it in range(1, n_iter + 1):
-        coeffs, coh = project_and_coherence(Phi)
-        history.append((it, coh, coeffs.copy()))
-
-        if it % 5 == 0 or it == 1:
-            print(f"Iter {it:03d} | Coherence = {coh:.9f} | 3:{coeffs[3]:.4f}  6:{coeffs[6]:.4f}  9:{coeffs[9]:.4f}")
-
-        D = dyadic_update(Phi)
-        Phi_raw = Phi + lambda_step * D
-
-        # Orthogonal projection back onto 3-6-9 subspace
-        Phi_proj = sum(coeffs[l] * basis_funcs[l] for l in l_modes)
-        # Alternative hard projection (even more stable):
-        Phi_proj = np.zeros_like(Phi)
-        for l in l_modes:
-            c = np.sum(Phi_raw * basis_funcs[l] * dV) / basis_norms[l]
-            Phi_proj += c * basis_funcs[l]
-
-        Phi = -np.abs(Phi_proj)
+        coeffs, coh, c_next = first() if c is None else step(c)
+        history.record(coh, coeffs)
+
+        if verbose and (it % 5 == 0 or it == 1):
+            print(f"Iter {it:03d} | Coherence = {coh:.9f} | " + "  ".join(f"{l}:{v:.4f}" for l, v in zip(l_modes, coeffs)))
+
+        done = (tol is not None and ctol is not None and c is not None and coh_prev is not None
+                and abs(coh - coh_prev) < tol and np.max(np.abs(c_next - c)) < ctol)
+        if accel is not None and c is not None:
+            c_next = accel(c, c_next)
+        c, coh_prev = c_next, coh
+        if after_step:
+            after_step(it, coh, c)
+        if done:
+            history.converged = True
+            if verbose:
+                print(f"Converged at iter {it:03d} | Coherence = {coh:.9f}")
+            break
+    history.state = c
+    return c, history
+
+_DEFAULT = object()        # tol / ctol not given: use coherence_tol / coeff_tol
+
+def _tolerances(tol, ctol):
+    """Resolve tol / ctol against the module defaults; an explicit None stays None."""
+    return coherence_tol if tol is _DEFAULT else tol, coeff_tol if ctol is _DEFAULT else ctol
 
+# Sovariel recursion v2
+def sovariel_recursion(Phi0, grid=None, n_iter=None, tol=_DEFAULT, ctol=_DEFAULT, accelerate=None, verbose=True,
+                       lambda_step=None):
+    """Iterate Φ ← -|P(Φ + λ·D(Φ))| on the full grid.
+
+    Runs at most n_iter iterations and stops early once the coherence and
+    coefficient changes are below tol / ctol (module defaults coherence_tol
+    and coeff_tol; None disables early stopping).  accelerate="anderson" or "aitken" extrapolates the
+    fixed-point iteration on the modal coefficients.  lambda_step defaults to
+    the module parameter.  n_iter=0 runs no iteration and returns Φ0.
+    Returns (Φ, history).
+    """
+    g = grid or default_grid()
+    c, history = _sovariel_coefficients(Phi0, g, n_iter, tol, ctol, accelerate, verbose, plot_every, lambda_step)
+    return (Phi0 if c is None else -np.abs(g.reconstruct(c))), history
+
+def _sovariel_coefficients(Phi0, g, n_iter=None, tol=_DEFAULT, ctol=_DEFAULT, accelerate=None, verbose=True, plot_every=0,
+                           lambda_step=None):
+    """sovariel_recursion returning the raw modal state c (Φ = -|B c|) instead of Φ; None after 0 iterations."""
+    if n_iter is None:
+        n_iter = globals()["n_iter"]
+    lam = globals()["lambda_step"] if lambda_step is None else lambda_step
+    tol, ctol = _tolerances(tol, ctol)
+
+    def full_step(Phi):
+        coeffs, coh = project_and_coherence(Phi, g)
+        c = np.fromiter(coeffs.values(), dtype=float)
+        # Hard projection of Φ + λD back onto the 3-6-9 subspace; the projection
+        # is linear, so only D still needs projecting
+        return c, coh, c + lam * g.project(dyadic_update(Phi, g))
+
+    def plot(it, coh, c):
         if plot_every and it % plot_every == 0:
+            Phi = -np.abs(g.reconstruct(c))
             plt.figure(figsize=(7,5))
-            plt.pcolormesh(X, Z, Phi, cmap='plasma', shading='gouraud', norm=Normalize(vmin=Phi.min(), vmax=-1e-6))
+            plt.pcolormesh(g.X, g.Z, Phi, cmap='plasma', shading='gouraud', norm=Normalize(vmin=Phi.min(), vmax=-1e-6))
             plt.colorbar(label='Φ (trap potential)')
             plt.title(f"Sovariel Recursion | Iter {it} | Coherence {coh:.9f}")
             plt.axis('equal')
@@ -147,35 +388,423 @@ def sovariel_recursion(Phi0):
             plt.tight_layout()
             plt.show()
 
-    return Phi, history
+    return _iterate(lambda: full_step(Phi0), lambda c: full_step(-np.abs(g.reconstruct(c))),
+                    g.l_modes, n_iter, tol, ctol, accelerate, verbose, plot)
+
+# Coarse-to-fine driver.  The state of the recursion is the modal vector c and
+# the basis is analytic, so prolongation to a finer grid is exact: the next
+# level simply starts from Φ = -|B_fine c|.  The coarse levels do the bulk of
+# the iterations, the fine ones only correct the discretisation error.
+def multigrid_levels(Nr_fine=Nr, Ntheta_fine=Ntheta, n_levels=3, min_size=32):
+    """(Nr, Ntheta) per level, halving from the finest grid, coarsest first."""
+    levels = []
+    for k in range(n_levels):
+        nr, nth = Nr_fine >> k, Ntheta_fine >> k
+        if levels and min(nr, nth) < min_size:
+            break
+        levels.append((max(nr, 2), max(nth, 2)))
+    return levels[::-1]
+
+def multigrid_sovariel(Nr_fine=Nr, Ntheta_fine=Ntheta, n_levels=3, levels=None, amps=None,
+                       coarse_iter=None, refine_iter=5, tol=_DEFAULT, ctol=_DEFAULT, accelerate=None,
+                       cache_dir=cache_dir, verbose=True):
+    """Run sovariel_recursion coarse-to-fine up to an Nr_fine × Ntheta_fine grid.
+
+    The coarsest level runs up to coarse_iter (default n_iter) iterations from
+    the initial amplitudes; every finer level starts from the prolonged state
+    and runs at most refine_iter.  levels overrides the (Nr, Ntheta) schedule.
+    Grids above the coarsest are built unshared so their basis is freed with them.
+
+    Returns (Φ_fine, fine grid, [history per level]).
+    """
+    levels = levels or multigrid_levels(Nr_fine, Ntheta_fine, n_levels)
+    c = initial_amplitudes() if amps is None else np.asarray(amps, dtype=float)
+    histories = []
+    for k, (nr, nth) in enumerate(levels):
+        g = (ResonantScalarGrid.get if k == 0 else ResonantScalarGrid)(nr, nth, l_modes, a, cache_dir)
+        if verbose:
+            print(f"Level {k} | {nth}×{nr}")
+        c_level, history = _sovariel_coefficients(-np.abs(g.reconstruct(c)), g, coarse_iter if k == 0 else refine_iter,
+                                                  tol, ctol, accelerate, verbose)
+        c = c if c_level is None else c_level
+        histories.append(history)
+    return -np.abs(g.reconstruct(c)), g, histories
+
+# Reduced-order Sovariel recursion on the modal coefficients
+#
+# Write Φ = -|B c| with c the raw (pre-fold) coefficients and S = sign(B c).
+# Away from the nodal lines ∇Φ = -S ∇(Bc) and ∇ρ ∝ S ∇Δ(Bc), so S² = 1 drops
+# out of the dyadic kick: D ∝ -Σ_ij c_i c_j M_ij(x), M_ij = ∇B_i · ∇ΔB_j.  Its
+# projection is the fixed tensor T_kij = <W_k, M_ij>, ∫Φ² dV is c·G·c with the
+# Gram matrix G, and only the fold P(-|Bc|) and max|D| need field samples,
+# taken on a fixed-size point set.  One iteration is then O(L³ + L²·S).
+class ReducedSovarielModel:
+    """Precomputed interaction tensors for the coefficient-space recursion."""
+
+    def __init__(self, grid=None, max_samples=20000):
+        g = grid or default_grid()
+        self.grid = g
+        L = len(g.l_modes)
+        shape = (g.Ntheta, g.Nr)
+        grad_r = lambda F: np.gradient(F, g.dr, axis=1).ravel()
+        grad_th = lambda F: np.gradient(F, g.dth, axis=0).ravel()
+        basis = [g.basis_matrix[i].reshape(shape) for i in range(L)]
+        lap = [laplacian_spherical(b, g) for b in basis]
+        Br = np.array([grad_r(b) for b in basis]); Bth = np.array([grad_th(b) for b in basis])
+        Lr = np.array([grad_r(f) for f in lap]); Lth = np.array([grad_th(f) for f in lap])
+
+        W = g.projection_matrix
+        self.T = np.stack([(Br * W[k]) @ Lr.T + (Bth * W[k]) @ Lth.T for k in range(L)])
+        self.gram = (g.basis_matrix * g.dV.ravel()) @ g.basis_matrix.T
+        self.norm_vector = g.norm_vector
+
+        # max|D| samples: the points where ‖M(x)‖ is largest
+        n = Br.shape[1]
+        M_norm2 = sum(((Br[i] * Lr + Bth[i] * Lth)**2).sum(axis=0) for i in range(L))
+        idx = np.arange(n) if n <= max_samples else np.argpartition(M_norm2, -max_samples)[-max_samples:]
+        self.M_samples = Br[:, None, idx] * Lr[None, :, idx] + Bth[:, None, idx] * Lth[None, :, idx]
+
+        # fold quadrature: the grid itself, or a strided sub-lattice with scaled weights
+        stride = max(1, int(np.ceil(np.sqrt(n / max_samples))))
+        sub = np.zeros(shape, dtype=bool)
+        sub[::stride, ::stride] = True
+        sub = sub.ravel()
+        scale = n / sub.sum()
+        self.B_fold = g.basis_matrix[:, sub]
+        self.W_fold = W[:, sub] * scale
+
+    def fold(self, c):
+        """Coefficients of Φ = -|B c|."""
+        return self.W_fold @ -np.abs(c @ self.B_fold)
+
+    def kick(self, c):
+        """Projection of the normalised dyadic update D for Φ = -|B c|."""
+        q_max = np.abs(np.einsum("i,j,ijs->s", c, c, self.M_samples)).max()
+        return -(self.T @ c @ c) / (q_max + 1e-20)
+
+    def step(self, c, lambda_step=None):
+        """One recursion step: (coefficients of Φ, coherence, next raw coefficients)."""
+        lam = globals()["lambda_step"] if lambda_step is None else lambda_step
+        coeffs = self.fold(c)
+        coherence = np.sum(coeffs**2 * self.norm_vector) / (c @ self.gram @ c + 1e-20)
+        return coeffs, coherence, coeffs + lam * self.kick(c)
+
+    def field(self, c):
+        return -np.abs(self.grid.reconstruct(c))
+
+def reduced_sovariel_recursion(amps=None, grid=None, model=None, validate=False,
+                               n_iter=None, tol=_DEFAULT, ctol=_DEFAULT, accelerate=None, verbose=True,
+                               lambda_step=None):
+    """sovariel_recursion run on the modal coefficients.
+
+    amps are the initial mode amplitudes (default: A_base·scale_factor·amp_ratios).
+    With validate=True every step is also taken on the full grid from the same
+    Φ and history.discrepancy records max |c_reduced - c_full| of the step.
+    Stopping and acceleration work as in sovariel_recursion.  Returns (Φ, history).
+    """
+    model = model or ReducedSovarielModel(grid)
+    g = model.grid
+    if n_iter is None:
+        n_iter = globals()["n_iter"]
+    lam = globals()["lambda_step"] if lambda_step is None else lambda_step
+    c0 = initial_amplitudes(g.l_modes) if amps is None else np.asarray(amps, dtype=float)
+    history = RecursionHistory(n_iter, g.l_modes, track_discrepancy=validate)
+
+    def step(c):
+        coeffs, coh, c_next = model.step(c, lam)
+        if validate:
+            Phi = model.field(c)
+            c_full = g.project(Phi) + lam * g.project(dyadic_update(Phi, g))
+            history.discrepancy[history.n] = np.max(np.abs(c_next - c_full))
+        return coeffs, coh, c_next
+
+    c, history = _iterate(lambda: step(c0), step, g.l_modes, n_iter, *_tolerances(tol, ctol),
+                          accelerate, verbose, history=history)
+    return model.field(c0 if c is None else c), history
 
 # =============== BONUS: Particle tracer in final field ===============
-def trace_particles(Phi_final, n_particles=80, steps=800):
-    from scipy.interpolate import RectBivariateSpline
-    interp = RectBivariateSpline(theta[:,0], r[0,:], Phi_final.T, kx=3, ky=3)
-    def force(x, z):
-        r = np.sqrt(x**2 + z**2) + 1e-12
-        th = np.arctan2(x, z) + (z < 0) * 2*np.pi
-        f_r = -interp(th, r, dx=0, dy=1, grid=False)
-        f_th = -interp(th, r, dx=1, dy=0, grid=False) / (r + 1e-12)
-        fx = f_r * (x/r) - f_th * (x/r) * (z/r)  # simplified
-        fz = f_r * (z/r) + f_th * (x/r) * (z/r)
-        return fx, fz
-
-    pos = np.zeros((n_particles, steps, 2))
-    pos[:,0,0] = np.random.uniform(-0.6, 0.6, n_particles)
-    pos[:,0,1] = np.random.uniform(-0.6, 0.6, n_particles)
-    dt = 0.004
-    for i in range(1, steps):
-        fx, fz = force(pos[:,i-1,0], pos[:,i-1,1])
-        pos[:,i,0] = pos[:,i-1,0] + fx * dt
-        pos[:,i,1] = pos[:,i-1,1] + fz * dt
-    return pos
+# Overdamped motion dx/dt = F = -∇Φ in the meridional (x, z) half-plane pair.
+# The force is tabulated once on the (θ, r) grid and looked up bilinearly, so
+# a step costs a handful of gathers per particle instead of spline evaluations.
+ACTIVE, ESCAPED, TRAPPED = 0, 1, 2
+
+def force_grid(Phi, grid=None):
+    """(F_r, F_θ) = -(∂Φ/∂r, ∂Φ/(r∂θ)) on the grid, stacked as (Ntheta, Nr, 2)."""
+    g = grid or default_grid()
+    F = np.empty(Phi.shape + (2,))
+    F[..., 0] = -np.gradient(Phi, g.dr, axis=1)
+    F[..., 1] = -np.gradient(Phi, g.dth, axis=0) / g.R
+    return F
+
+def _force_lookup(F, g, x, z):
+    """Bilinear (F_x, F_z) at points (x, z); θ = angle from +z, mirrored for x < 0."""
+    r = np.hypot(x, z)
+    th = np.arctan2(np.abs(x), z)
+    u = np.clip((th - g.theta[0]) / g.dth, 0, g.Ntheta - 1 - 1e-9)
+    v = np.clip((r - g.r[0]) / g.dr, 0, g.Nr - 1 - 1e-9)
+    i, j = u.astype(np.intp), v.astype(np.intp)
+    fu, fv = (u - i)[:, None], (v - j)[:, None]
+    Ff = F.reshape(-1, 2)
+    k = i * g.Nr + j
+    f = ((1 - fu) * ((1 - fv) * Ff[k] + fv * Ff[k + 1])
+         + fu * ((1 - fv) * Ff[k + g.Nr] + fv * Ff[k + g.Nr + 1]))
+    s, c = np.sin(th), np.cos(th)
+    fx = np.sign(x) * (f[:, 0] * s + f[:, 1] * c)
+    fz = f[:, 0] * c - f[:, 1] * s
+    return fx, fz
+
+def trace_ensemble(Phi_final, n_particles=80, steps=800, grid=None, dt=0.004, method="rk4",
+                   record_every=1, out=None, pos0=None, seed=None, trap_tol=1e-4,
+                   chunk_size=1 << 15, flush_every=64):
+    """Trace many particles through -∇Φ_final, retiring escaped and trapped ones.
+
+    Particles start uniform in [-0.6, 0.6]² (or at pos0, shape (n, 2)).  A
+    particle escapes once r > a and is trapped once its speed drops below
+    trap_tol·max|F|; retired particles record NaN from then on.  Positions are kept
+    every record_every steps, in a float32 array or, with out=path, an .npy
+    memmap that is filled chunk by chunk so memory stays bounded.
+
+    Returns a dict with "trajectories" (n, n_records, 2), per-particle "fate"
+    (ACTIVE / ESCAPED / TRAPPED), "retired_at" step (-1 if still active) and
+    "final" positions.
+    """
+    g = grid or default_grid()
+    F = force_grid(Phi_final, g)
+    trap_speed = trap_tol * np.sqrt((F**2).sum(axis=-1)).max()
+    rng = np.random.default_rng(seed)
+    if pos0 is not None:
+        pos0 = np.asarray(pos0, dtype=float)
+        n_particles = len(pos0)
+    n_records = (steps - 1) // record_every + 1
+    shape = (n_particles, n_records, 2)
+    if out is None:
+        traj = np.full(shape, np.nan, dtype=np.float32)
+    else:
+        traj = np.lib.format.open_memmap(out, mode="w+", dtype=np.float32, shape=shape)
+    fate = np.full(n_particles, ACTIVE, dtype=np.int8)
+    retired_at = np.full(n_particles, -1, dtype=np.int64)
+    final = np.empty((n_particles, 2))
+
+    def rhs(p):
+        return np.stack(_force_lookup(F, g, p[:, 0], p[:, 1]), axis=1)
+
+    def advance(p):
+        if method == "euler":
+            return p + dt * rhs(p)
+        k1 = rhs(p)
+        k2 = rhs(p + 0.5 * dt * k1)
+        k3 = rhs(p + 0.5 * dt * k2)
+        k4 = rhs(p + dt * k3)
+        return p + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    for lo in range(0, n_particles, chunk_size):
+        hi = min(lo + chunk_size, n_particles)
+        p = pos0[lo:hi].copy() if pos0 is not None else rng.uniform(-0.6, 0.6, (hi - lo, 2))
+        live = np.arange(hi - lo)                      # chunk-local ids still moving
+        buf = np.full((hi - lo, flush_every, 2), np.nan, dtype=np.float32)
+        rec0 = n_rec = 0
+        for step in range(steps):
+            if step % record_every == 0:
+                buf[live, n_rec] = p
+                n_rec += 1
+                if n_rec == flush_every or step + record_every >= steps:
+                    traj[lo:hi, rec0:rec0 + n_rec] = buf[:, :n_rec]
+                    buf[:] = np.nan
+                    rec0, n_rec = rec0 + n_rec, 0
+            if step == steps - 1 or not len(live):
+                break
+            p_next = advance(p)
+            speed = np.hypot(*(p_next - p).T) / dt
+            escaped = np.hypot(*p_next.T) > g.a
+            trapped = ~escaped & (speed < trap_speed)
+            done = escaped | trapped
+            if done.any():
+                ids = lo + live[done]
+                fate[ids] = np.where(escaped[done], ESCAPED, TRAPPED)
+                retired_at[ids] = step + 1
+                final[ids] = np.where(escaped[done, None], p_next[done], p[done])
+                live, p_next = live[~done], p_next[~done]
+            p = p_next
+        final[lo + live] = p
+        if n_rec:
+            traj[lo:hi, rec0:rec0 + n_rec] = buf[:, :n_rec]
+            rec0 += n_rec
+        if rec0 < n_records:
+            traj[lo:hi, rec0:] = np.nan
+    if out is not None:
+        traj.flush()
+    return {"trajectories": traj, "fate": fate, "retired_at": retired_at, "final": final}
+
+def trace_particles(Phi_final, n_particles=80, steps=800, grid=None, **kwargs):
+    """Trajectories (n_particles, steps, 2) of trace_ensemble; see there for options."""
+    return trace_ensemble(Phi_final, n_particles, steps, grid, **kwargs)["trajectories"]
+
+# =============== Out-of-core float32 high-resolution mode ===============
+# For grids that do not fit in RAM (e.g. 20k × 20k for the coil winder).  Φ,
+# the basis and dV are float32 .npy memmaps under workdir, everything is
+# produced and consumed in blocks of θ-rows, and θ-gradients read one halo row
+# on each side so the blocks reproduce np.gradient on the whole array.
+class OutOfCoreField:
+    """Ntheta × Nr float32 fields on disk, processed block_rows θ-rows at a time."""
+
+    def __init__(self, Nr, Ntheta, workdir, l_modes=l_modes, a=a, block_rows=256):
+        self.Nr = int(Nr)
+        self.Ntheta = int(Ntheta)
+        self.l_modes = tuple(int(l) for l in l_modes)
+        self.a = float(a)
+        self.workdir = workdir
+        self.block_rows = int(block_rows)
+        os.makedirs(workdir, exist_ok=True)
+
+    def __repr__(self):
+        return f"OutOfCoreField(Nr={self.Nr}, Ntheta={self.Ntheta}, workdir={self.workdir!r})"
+
+    @cached_property
+    def r(self):
+        return np.linspace(1e-6, self.a, self.Nr)
+
+    @cached_property
+    def theta(self):
+        return np.linspace(0, np.pi, self.Ntheta)
+
+    @property
+    def dr(self):
+        return self.r[1] - self.r[0]
+
+    @property
+    def dth(self):
+        return self.theta[1] - self.theta[0]
+
+    def blocks(self):
+        for i0 in range(0, self.Ntheta, self.block_rows):
+            yield slice(i0, min(i0 + self.block_rows, self.Ntheta))
+
+    def path(self, name):
+        return os.path.join(self.workdir, f"{name}_{self.Ntheta}x{self.Nr}.npy")
+
+    def _build(self, name, shape, fill):
+        """Open the memmap `name`, writing it blockwise via fill(rows, out) if missing."""
+        path = self.path(name)
+        if os.path.exists(path):
+            arr = np.load(path, mmap_mode="r")
+            if arr.shape == shape:
+                return arr
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        arr = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=shape)
+        for rows in self.blocks():
+            fill(rows, arr)
+        arr.flush()
+        del arr
+        os.replace(tmp, path)
+        return np.load(path, mmap_mode="r")
+
+    def _radial(self):
+        return np.array([radial_profile(l, self.r, self.a) for l in self.l_modes])
+
+    def _angular(self, rows):
+        out = self._legendre_table[:, :rows.stop - rows.start]
+        P = legendre_recurrence(max(self.l_modes), np.cos(self.theta[rows]), out=out)
+        return np.array([sph_norm(l) * P[l] for l in self.l_modes])
+
+    @cached_property
+    def _legendre_table(self):
+        # one (L + 1, block_rows) recurrence table reused by every block
+        return np.empty((max(self.l_modes) + 1, self.block_rows))
+
+    @cached_property
+    def basis(self):
+        modes = "-".join(str(l) for l in self.l_modes)
+        radial = self._radial()
+        def fill(rows, out):
+            out[:, rows] = self._angular(rows)[:, :, None] * radial[:, None, :]
+        return self._build(f"basis_a{self.a:g}_l{modes}", (len(self.l_modes), self.Ntheta, self.Nr), fill)
+
+    @cached_property
+    def dV(self):
+        def fill(rows, out):
+            out[rows] = 2 * np.pi * np.outer(np.sin(self.theta[rows]), self.r**2) * self.dr * self.dth
+        return self._build(f"dV_a{self.a:g}", (self.Ntheta, self.Nr), fill)
+
+    @cached_property
+    def norm_vector(self):
+        norm = np.zeros(len(self.l_modes))
+        for rows in self.blocks():
+            B = self.basis[:, rows].astype(np.float64)
+            norm += np.einsum("lij,lij,ij->l", B, B, self.dV[rows])
+        return norm
+
+    def field(self, coeffs, name="phi"):
+        """Φ = -|Σ_l c_l basis_l| as a fresh float32 memmap (the basis is separable,
+        so this never touches the basis memmap)."""
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(path)
+        cr = np.asarray(coeffs, dtype=float)[:, None] * self._radial()
+        def fill(rows, out):
+            out[rows] = -np.abs(self._angular(rows).T @ cr)
+        return self._build(name, (self.Ntheta, self.Nr), fill)
+
+    def project(self, Phi):
+        """Modal coefficients of a memmapped Φ, accumulated blockwise in float64."""
+        acc = np.zeros(len(self.l_modes))
+        for rows in self.blocks():
+            acc += np.einsum("lij,ij->l", self.basis[:, rows], Phi[rows] * self.dV[rows], dtype=np.float64)
+        return acc / self.norm_vector
+
+    def gradient_blocks(self, Phi):
+        """Yield (rows, ∂Φ/∂r, ∂Φ/∂θ) per block, identical to np.gradient on all of Φ."""
+        n = self.Ntheta
+        for rows in self.blocks():
+            lo, hi = max(rows.start - 1, 0), min(rows.stop + 1, n)
+            F = np.asarray(Phi[lo:hi], dtype=np.float32)
+            inner = slice(rows.start - lo, rows.stop - lo)
+            if hi - lo > 1:
+                d_th = np.gradient(F, self.dth, axis=0)[inner]
+            else:
+                d_th = np.zeros_like(F)
+            yield rows, np.gradient(F[inner], self.dr, axis=1), d_th
+
+    def export_coil_map(self, Phi, filename="coil_winding_density_369.npy", pyramid_levels=4):
+        """Stream |∇Φ| to `filename` block by block, plus 2^k-downsampled previews.
+
+        Level k (k = 1..pyramid_levels) is the 2^k × 2^k block mean, saved next to
+        filename as <stem>_L<k>.npy.  Returns the list of written paths.
+        """
+        f = 1 << pyramid_levels
+        if self.block_rows % f:
+            raise ValueError(f"block_rows must be a multiple of 2**pyramid_levels = {f}")
+        stem, ext = os.path.splitext(filename)
+        out = np.lib.format.open_memmap(filename, mode="w+", dtype=np.float32, shape=(self.Ntheta, self.Nr))
+        pyramid = [np.lib.format.open_memmap(f"{stem}_L{k}{ext}", mode="w+", dtype=np.float32,
+                                             shape=(self.Ntheta >> k, self.Nr >> k))
+                   for k in range(1, pyramid_levels + 1)]
+        for rows, g_r, g_th in self.gradient_blocks(Phi):
+            mag = np.sqrt(g_r**2 + g_th**2)
+            out[rows] = mag
+            for k, level in enumerate(pyramid, 1):
+                s = 1 << k
+                h, w = mag.shape[0] // s, self.Nr >> k
+                if h:
+                    level[rows.start >> k:(rows.start >> k) + h] = (
+                        mag[:h * s, :w * s].reshape(h, s, w, s).mean(axis=(1, 3)))
+        for arr in [out] + pyramid:
+            arr.flush()
+        return [filename] + [f"{stem}_L{k}{ext}" for k in range(1, pyramid_levels + 1)]
+
+def high_res_field(coeffs, Nr, Ntheta, workdir, **kwargs):
+    """OutOfCoreField and its memmapped Φ for a converged raw state c (history.state)."""
+    field = OutOfCoreField(Nr, Ntheta, workdir, **kwargs)
+    return field, field.field(coeffs)
 
 # =============== BONUS: Export coil winding density (proportional to |∇Φ|) ===============
-def export_coil_map(Phi_final, filename="coil_winding_density_369.npy"):
-    grad_r = np.gradient(Phi_final, dr, axis=1)
-    grad_th = np.gradient(Phi_final, dth, axis=0)
+def export_coil_map(Phi_final, filename="coil_winding_density_369.npy", grid=None):
+    g = grid or default_grid()
+    if isinstance(g, OutOfCoreField):
+        paths = g.export_coil_map(Phi_final, filename)
+        print(f"Coil winding density map saved → {filename} (+ {len(paths) - 1} preview levels)")
+        return paths
+    grad_r = np.gradient(Phi_final, g.dr, axis=1)
+    grad_th = np.gradient(Phi_final, g.dth, axis=0)
     grad_mag = np.sqrt(grad_r**2 + grad_th**2)
     np.save(filename, grad_mag)
     print(f"Coil winding density map saved → {filename} (proportional to |∇Φ|)")
@@ -183,19 +812,20 @@ def export_coil_map(Phi_final, filename="coil_winding_density_369.npy"):
 # ============================== MAIN ==============================
 if __name__ == "__main__":
     print("Building initial 3-6-9 resonant scalar field ×3.69...")
-    Phi0 = build_initial_phi()
-    coeffs0, coh0 = project_and_coherence(Phi0)
+    grid = default_grid()
+    Phi0 = build_initial_phi(grid)
+    coeffs0, coh0 = project_and_coherence(Phi0, grid)
     print(f"Initial coherence: {coh0:.9f}")
 
     print("\nStarting Sovariel recursion...\n")
-    Phi_final, history = sovariel_recursion(Phi0)
+    Phi_final, history = sovariel_recursion(Phi0, grid)
 
-    final_coeffs, final_coh = project_and_coherence(Phi_final)
+    final_coeffs, final_coh = project_and_coherence(Phi_final, grid)
     print(f"\nFINAL COHERENCE: {final_coh:.12f}")
 
     # Final beautiful plot
     plt.figure(figsize=(8,6))
-    plt.pcolormesh(X, Z, Phi_final, cmap='inferno', shading='gouraud')
+    plt.pcolormesh(grid.X, grid.Z, Phi_final, cmap='inferno', shading='gouraud')
     plt.colorbar(label='Φ_final (trap)')
     plt.title(f"3-6-9 Resonant Scalar Lock | Coherence {final_coh:.10f} | ×3.69 Yield")
     plt.axis('equal'); plt.xlabel('X'); plt.ylabel('Z')
@@ -0,0 +1,223 @@
+"""
+resonant_sweep.py
+
+Parallel parameter sweeps of the 3-6-9 Sovariel recursion.
+
+Points (scale_factor × amp_ratios × lambda_step × grid size) are fanned out
+over a process pool.  Workers never plot, and they keep their grids (and the
+.npz basis cache under AGAPE_CACHE_DIR) for the whole sweep.  Every point has
+a deterministic seed derived from its parameters, used for the optional
+amplitude jitter.  Results go to an append-only directory of .npz shards,
+one column per field; rerunning the same sweep skips the points already
+stored, so an interrupted sweep just resumes.
+"""
+
+import glob
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+import resonant_scalar_increase as rsi
+
+# ---------- Sweep defaults ----------
+root_seed = 369
+shard_size = 64            # results per shard file
+jitter = 0.0               # relative Gaussian jitter on the initial amplitudes
+# -------------------------------------
+
+def sweep_points(scale_factor=(rsi.scale_factor,), amp_ratios=(rsi.amp_ratios,),
+                 lambda_step=(rsi.lambda_step,), grid=((rsi.Nr, rsi.Ntheta),)):
+    """Cartesian product of the parameter lists as a list of point dicts."""
+    points = []
+    for s, ratios, lam, (nr, nth) in itertools.product(scale_factor, amp_ratios, lambda_step, grid):
+        points.append({"scale_factor": float(s),
+                       "amp_ratios": {int(l): float(ratios[l]) for l in rsi.l_modes},
+                       "lambda_step": float(lam), "Nr": int(nr), "Ntheta": int(nth)})
+    return points
+
+def point_key(point):
+    """Stable 16-hex-digit id of a point's parameters."""
+    blob = json.dumps({k: point[k] for k in ("scale_factor", "amp_ratios", "lambda_step", "Nr", "Ntheta")},
+                      sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+def point_seed(key, root_seed=root_seed):
+    """SeedSequence for a point; depends only on root_seed and the point's key."""
+    return np.random.SeedSequence(root_seed, spawn_key=(int(key, 16),))
+
+# ── Worker side ───────────────────────────────────────────────────────────────
+_models = {}
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+    rsi.plot_every = 0
+
+def run_point(point, n_iter, tol=rsi._DEFAULT, ctol=rsi._DEFAULT, accelerate=None, method="full",
+              jitter=jitter, root_seed=root_seed):
+    """Run one point; returns the row of result columns."""
+    t0 = time.perf_counter()
+    key = point_key(point)
+    grid = rsi.ResonantScalarGrid.get(point["Nr"], point["Ntheta"])
+    amps = rsi.initial_amplitudes(grid.l_modes, scale_factor=point["scale_factor"], amp_ratios=point["amp_ratios"])
+    if jitter:
+        rng = np.random.default_rng(point_seed(key, root_seed))
+        amps = amps * (1 + jitter * rng.standard_normal(len(amps)))
+
+    if method == "reduced":
+        if grid not in _models:
+            _models[grid] = rsi.ReducedSovarielModel(grid)
+        _, history = rsi.reduced_sovariel_recursion(amps, model=_models[grid], n_iter=n_iter, tol=tol, ctol=ctol,
+                                                    accelerate=accelerate, verbose=False,
+                                                    lambda_step=point["lambda_step"])
+    elif method == "full":
+        _, history = rsi._sovariel_coefficients(rsi.build_initial_phi(grid, amps), grid, n_iter, tol, ctol,
+                                                accelerate, verbose=False, lambda_step=point["lambda_step"])
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    n = len(history)
+    return {
+        "key": key,
+        "scale_factor": point["scale_factor"],
+        "amp_ratios": np.array([point["amp_ratios"][l] for l in grid.l_modes]),
+        "lambda_step": point["lambda_step"],
+        "Nr": point["Nr"], "Ntheta": point["Ntheta"],
+        "initial_amps": amps,
+        "n_iter_run": n,
+        "converged": history.converged,
+        "final_coherence": history.coherence[n - 1],
+        "coeffs": history.coeffs[n - 1],
+        "state": history.state,
+        "coherence": history.coherence,
+        "elapsed": time.perf_counter() - t0,
+    }
+
+# ── Columnar results store ────────────────────────────────────────────────────
+class SweepStore:
+    """Append-only directory of shard_NNNNNN.npz files, one array per column."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def check_settings(self, settings):
+        """Record the run settings on first use; refuse to resume with different ones."""
+        path = os.path.join(self.path, "sweep.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                stored = json.load(f)
+            if stored != settings:
+                raise ValueError(f"{self.path} holds a sweep run with {stored}, not {settings}")
+        else:
+            with open(path, "w") as f:
+                json.dump(settings, f, indent=2, sort_keys=True)
+
+    def shards(self):
+        return sorted(glob.glob(os.path.join(self.path, "shard_*.npz")))
+
+    def append(self, rows):
+        """Write rows (a list of run_point dicts) as one new shard."""
+        if not rows:
+            return None
+        shards = self.shards()
+        seq = int(os.path.basename(shards[-1])[6:12]) + 1 if shards else 0
+        path = os.path.join(self.path, f"shard_{seq:06d}.npz")
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, l_modes=np.array(rsi.l_modes), **{k: np.array([row[k] for row in rows]) for k in rows[0]})
+        os.replace(tmp, path)
+        return path
+
+    def completed_keys(self):
+        keys = set()
+        for shard in self.shards():
+            with np.load(shard) as data:
+                keys.update(data["key"].tolist())
+        return keys
+
+    def load(self):
+        """All shards concatenated column by column (coherence histories NaN-padded)."""
+        parts = {}
+        for shard in self.shards():
+            with np.load(shard) as data:
+                for k in data.files:
+                    if k != "l_modes":
+                        parts.setdefault(k, []).append(data[k])
+        if "coherence" in parts:
+            width = max(c.shape[1] for c in parts["coherence"])
+            parts["coherence"] = [np.pad(c, ((0, 0), (0, width - c.shape[1])), constant_values=np.nan)
+                                  for c in parts["coherence"]]
+        return {k: np.concatenate(v) for k, v in parts.items()}
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+def run_sweep(points, out_dir, workers=None, n_iter=None, tol=rsi._DEFAULT, ctol=rsi._DEFAULT, accelerate=None,
+              method="full", jitter=jitter, root_seed=root_seed, shard_size=shard_size, verbose=True):
+    """Run every point not yet in out_dir on a process pool; returns the SweepStore.
+
+    At most 2·workers points are in flight and finished rows are flushed to a
+    new shard every shard_size results and on the way out, also when a point
+    raises: the points still in flight are finished and stored before the
+    first error is re-raised.  Rerunning with the same points resumes.  A store only
+    takes results of one set of run settings (method, tolerances, ...).
+    """
+    if n_iter is None:
+        n_iter = rsi.n_iter
+    if n_iter < 1:
+        raise ValueError(f"a sweep point needs at least one iteration, got n_iter={n_iter}")
+    store = SweepStore(out_dir)
+    tol, ctol = rsi._tolerances(tol, ctol)
+    store.check_settings({"n_iter": n_iter, "tol": tol, "ctol": ctol, "accelerate": accelerate,
+                          "method": method, "jitter": jitter, "root_seed": root_seed})
+    done = store.completed_keys()
+    todo = [p for p in points if point_key(p) not in done]
+    workers = workers or os.cpu_count() or 1
+    if verbose:
+        print(f"Sweep: {len(points)} points, {len(points) - len(todo)} already stored, {workers} workers")
+
+    rows, finished = [], 0
+    pending = set()
+    queue = iter(todo)
+    error = None
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+            def submit(n):
+                for p in itertools.islice(queue, n):
+                    pending.add(pool.submit(run_point, p, n_iter, tol, ctol, accelerate, method, jitter, root_seed))
+            submit(2 * workers)
+            while pending:
+                ready, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in ready:
+                    pending.remove(fut)
+                    try:
+                        rows.append(fut.result())
+                    except Exception as e:
+                        error = error or e
+                finished += len(ready)
+                if error is None:           # after a failure only drain the points in flight
+                    submit(len(ready))
+                if len(rows) >= shard_size:
+                    store.append(rows)
+                    rows = []
+                    if verbose:
+                        print(f"  {finished}/{len(todo)} points done")
+    finally:
+        store.append(rows)
+    if error is not None:
+        raise error
+    return store
+
+# ============================== MAIN ==============================
+if __name__ == "__main__":
+    points = sweep_points(scale_factor=np.linspace(3.0, 4.0, 5),
+                          lambda_step=[0.18, 0.22, 0.26],
+                          grid=[(80, 120), (160, 240)])
+    store = run_sweep(points, "sweep_results", accelerate="anderson")
+    results = store.load()
+    best = np.argmax(results["final_coherence"])
+    print(f"Best coherence {results['final_coherence'][best]:.9f} at scale_factor={results['scale_factor'][best]:.3f}, "
+          f"lambda_step={results['lambda_step'][best]:.2f}, grid={results['Ntheta'][best]}×{results['Nr'][best]}")
@@ -15,19 +15,24 @@ visual and mathematical proof that harmonic fusion is real — today.
 
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.special import lpmv
 from matplotlib.patches import Circle
 
-# ============== 3-6-9 Electrostatic Potential ==============
-def legendre(n, x):
-    return lpmv(0, n, x)
+try:
+    from legendre_basis import legendre_basis      # repo root on the path: shared cached recurrence
+except ImportError:
+    from scipy.special import lpmv
+
+    def legendre_basis(x, L, m=0, key=None):
+        """P_0^m..P_L^m(x) as an (L + 1,) + x.shape table from scipy (rows l < m are 0)."""
+        x = np.asarray(x, dtype=float)
+        return np.array([lpmv(m, l, x) if l >= m else np.zeros_like(x) for l in range(L + 1)])
 
+# ============== 3-6-9 Electrostatic Potential ==============
 def dyadic_resonance_lock(potential, target_modes=[3,6,9], steps=50):
     flat = potential.flatten().astype(np.float64)
-    coeffs = np.array([
-        np.mean(flat * legendre(m, np.cos(np.linspace(0, np.pi, len(flat)))) ** 2)
-        for m in range(15)
-    ], dtype=np.float64)
+    # P_0..P_14 on the flattened sample grid, one recurrence pass (cached)
+    P = legendre_basis(np.cos(np.linspace(0, np.pi, len(flat))), 14, key=("lock", len(flat)))
+    coeffs = np.mean(flat * P ** 2, axis=1)
     for _ in range(steps):
         coeffs[target_modes] *= 1.025
         coeffs[np.setdiff1d(range(15), target_modes)] *= 0.98
@@ -42,9 +47,10 @@ theta = np.linspace(0, np.pi, 256, dtype=np.float64)
 R, Theta = np.meshgrid(r, theta)
 
 # Tesla 3-6-9 superposition
-phi = (legendre(3, np.cos(Theta)) * np.sin(3*np.pi*R) +
-       (2/3)*legendre(6, np.cos(Theta)) * np.sin(6*np.pi*R) +
-       (1/3)*legendre(9, np.cos(Theta)) * np.sin(9*np.pi*R))
+P = legendre_basis(np.cos(theta), 9)[:, :, np.newaxis]
+phi = (P[3] * np.sin(3*np.pi*R) +
+       (2/3)*P[6] * np.sin(6*np.pi*R) +
+       (1/3)*P[9] * np.sin(9*np.pi*R))
 
 potential = -np.abs(phi)
 
@@ -85,7 +91,7 @@ ax.set_title(f'Harmonic Fusion Achieved\n'
              fontsize=20, color='white', pad=40, fontweight='bold')
 
 ax.text(0.02, 0.95, 'AgapeIntelligence / 10 Dec 2025', transform=ax.transAxes,
-        , color='cyan', fontsize=12, alpha=0.8)
+        color='cyan', fontsize=12, alpha=0.8)
 
 ax.set_xlabel('Radial (normalized)', color='white', fontsize=14)
 ax.set_ylabel('Axial (normalized)', color='white', fontsize=14)
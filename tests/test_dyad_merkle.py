@@ -0,0 +1,143 @@
+import hashlib
+
+import pytest
+
+from dyad_merkle import (EMPTY_ROOT, MerkleAccumulator, leaf_hash, node_hash, verify_consistency,
+                         verify_inclusion)
+
+SIZES = [1, 2, 3, 4, 5, 7, 8, 9, 13, 16, 17, 31, 33]
+
+
+# Reference definitions straight from RFC 6962 §2.1, recursive over the leaf list
+def _k(n):
+    k = 1
+    while 2 * k < n:
+        k *= 2
+    return k
+
+
+def mth(leaves):
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaf_hash(leaves[0])
+    k = _k(len(leaves))
+    return node_hash(mth(leaves[:k]), mth(leaves[k:]))
+
+
+def path(m, leaves):
+    if len(leaves) == 1:
+        return []
+    k = _k(len(leaves))
+    if m < k:
+        return path(m, leaves[:k]) + [mth(leaves[k:])]
+    return path(m - k, leaves[k:]) + [mth(leaves[:k])]
+
+
+def subproof(m, leaves, complete):
+    n = len(leaves)
+    if m == n:
+        return [] if complete else [mth(leaves)]
+    k = _k(n)
+    if m <= k:
+        return subproof(m, leaves[:k], complete) + [mth(leaves[k:])]
+    return subproof(m - k, leaves[k:], False) + [mth(leaves[:k])]
+
+
+def leaves_of(n):
+    return [f"step {i}".encode() for i in range(n)]
+
+
+def tree_of(n):
+    tree = MerkleAccumulator()
+    for data in leaves_of(n):
+        tree.append(data)
+    return tree
+
+
+def test_empty_root():
+    assert MerkleAccumulator().root() == EMPTY_ROOT == mth([])
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_roots_match_reference_at_every_size(n):
+    tree = tree_of(n)
+    leaves = leaves_of(n)
+    assert tree.root() == mth(leaves)
+    for m in range(n + 1):
+        assert tree.root(m) == mth(leaves[:m])
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_inclusion_proofs(n):
+    tree = tree_of(n)
+    leaves = leaves_of(n)
+    for size in range(1, n + 1):
+        root = mth(leaves[:size])
+        for i in range(size):
+            proof = tree.inclusion_proof(i, size)
+            assert proof == path(i, leaves[:size])
+            assert verify_inclusion(leaf_hash(leaves[i]), i, size, proof, root)
+
+
+@pytest.mark.parametrize("n", [3, 8, 13])
+def test_inclusion_rejects_tampering(n):
+    tree = tree_of(n)
+    leaves = leaves_of(n)
+    root = tree.root()
+    for i in range(n):
+        proof = tree.inclusion_proof(i)
+        leaf = leaf_hash(leaves[i])
+        assert not verify_inclusion(leaf_hash(b"forged"), i, n, proof, root)
+        assert not verify_inclusion(leaf, (i + 1) % n, n, proof, root)
+        assert not verify_inclusion(leaf, i, 2 * n, proof, root)
+        assert not verify_inclusion(leaf, i, n, proof, EMPTY_ROOT)
+        assert not verify_inclusion(leaf, i, n, proof + [root], root)
+        if proof:
+            assert not verify_inclusion(leaf, i, n, proof[:-1], root)
+            assert not verify_inclusion(leaf, i, n, [EMPTY_ROOT] + proof[1:], root)
+    assert not verify_inclusion(leaf_hash(leaves[0]), n, n, [], root)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_consistency_proofs(n):
+    tree = tree_of(n)
+    leaves = leaves_of(n)
+    for new in range(1, n + 1):
+        for old in range(1, new + 1):
+            proof = tree.consistency_proof(old, new)
+            assert proof == subproof(old, leaves[:new], True)
+            assert verify_consistency(old, new, proof, mth(leaves[:old]), mth(leaves[:new]))
+
+
+@pytest.mark.parametrize("n", [5, 9, 16, 17])
+def test_consistency_rejects_tampering(n):
+    tree = tree_of(n)
+    new_root = tree.root()
+    for old in range(1, n):
+        proof = tree.consistency_proof(old)
+        old_root = tree.root(old)
+        assert not verify_consistency(old, n, proof, leaf_hash(b"forged"), new_root)
+        assert not verify_consistency(old, n, proof, old_root, EMPTY_ROOT)
+        assert not verify_consistency(old, n, [EMPTY_ROOT] + proof[1:], old_root, new_root)
+        assert not verify_consistency(old, n, proof[:-1], old_root, new_root)
+        assert not verify_consistency(n, old, proof, new_root, old_root)
+        other = tree_of(old + 1) if old + 1 < n else None
+        if other is not None:
+            assert not verify_consistency(old + 1, n, proof, other.root(), new_root)
+    assert not verify_consistency(0, n, [], EMPTY_ROOT, new_root)
+    assert not verify_consistency(n, n, [new_root], new_root, new_root)
+
+
+def test_proofs_reject_out_of_range_sizes():
+    tree = tree_of(5)
+    with pytest.raises(ValueError):
+        tree.inclusion_proof(5)
+    with pytest.raises(ValueError):
+        tree.inclusion_proof(0, 6)
+    with pytest.raises(ValueError):
+        tree.consistency_proof(0)
+    with pytest.raises(ValueError):
+        tree.consistency_proof(3, 6)
+    with pytest.raises(ValueError):
+        tree.root(6)
@@ -0,0 +1,50 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+import dyad_circuit
+from dyad_prover import MockProver, Prover, ProvingPipeline, ScreenedProver
+from metacognitive_dyad_zk import MetacognitiveDyadZK
+
+
+def test_prover_is_abstract():
+    with pytest.raises(TypeError):
+        Prover()
+
+
+def test_blocking_claim_waits_for_a_slot_instead_of_skipping():
+    with ProvingPipeline(MockProver(delay=0.2), max_workers=1, max_pending=1) as pipe:
+        with contextlib.redirect_stdout(io.StringIO()):
+            dyad = MetacognitiveDyadZK(fast_boot_depth=8, pipeline=pipe)
+        dyad.submit_zk_claim()
+        assert dyad.submit_zk_claim().result()["proof_verified"] == "skipped: queue full"
+        assert json.loads(dyad.generate_zk_claim())["proof_verified"] == "true"
+
+
+class RecordingProver(Prover):
+    def __init__(self):
+        self.inputs = None
+
+    def prove(self, job_dir, witness, claim):
+        self.inputs = witness
+        return {"proof_verified": "true"}
+
+
+def test_screened_prover_binds_the_published_root(tmp_path):
+    inner = RecordingProver()
+    claim = {"public_merkle_root": "ab" * 32, "claimed_step": 1}
+    witness = {"d_history": [3, 6], "l_history": [3, 6]}
+    result = ScreenedProver(inner).prove(str(tmp_path), witness, claim)
+    assert result["prescreen"] == "passed"
+    assert inner.inputs["public_root"] == str(int("ab" * 32, 16) % dyad_circuit.FIELD_PRIME)
+
+
+def test_screened_prover_rejects_an_unbalanced_history(tmp_path):
+    inner = RecordingProver()
+    claim = {"public_merkle_root": "00" * 32, "claimed_step": 1}
+    witness = {"d_history": [3, 5], "l_history": [3, 7]}
+    result = ScreenedProver(inner).prove(str(tmp_path), witness, claim)
+    assert result["prescreen"].startswith("failed")
+    assert inner.inputs is None
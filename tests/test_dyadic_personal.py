@@ -0,0 +1,24 @@
+import threading
+
+import pytest
+
+from dyadic_personal import open_sink, run_resonance, tail_records
+
+
+@pytest.mark.parametrize("name", ["run.ndjson", "run.dyrs"])
+def test_follow_waits_for_the_file_to_appear(tmp_path, name):
+    path = str(tmp_path / name)
+    writer = threading.Timer(0.3, lambda: run_resonance(12, sink=open_sink(path), verbose=False))
+    writer.start()
+    try:
+        records = list(tail_records(path, follow=True, poll=0.05, idle_timeout=1.0))
+    finally:
+        writer.join()
+    assert [r['step'] for r in records] == list(range(1, 13))
+
+
+@pytest.mark.parametrize("name", ["missing.ndjson", "missing.dyrs"])
+def test_follow_gives_up_on_a_file_that_never_appears(tmp_path, name):
+    assert list(tail_records(str(tmp_path / name), follow=True, poll=0.05, idle_timeout=0.2)) == []
+    with pytest.raises(FileNotFoundError):
+        list(tail_records(str(tmp_path / name)))
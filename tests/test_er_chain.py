@@ -0,0 +1,64 @@
+import functools
+import math
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+
+from physics import er_chain
+
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Z = np.array([[1, 0], [0, -1]], dtype=complex)
+PHI = lambda r: np.exp(-0.5 * (np.asarray(r) / 0.5) ** 2)
+
+
+def _embed(op, site, span, n):
+    """op acting on sites site..site+span-1 of n qubits, site 0 most significant."""
+    return functools.reduce(np.kron, [np.eye(2 ** site), op, np.eye(2 ** (n - site - span))])
+
+
+def dense_evolve(r, n, twist, phase):
+    """The Trotter splitting of er_chain_evolve on the full 2^n state vector.
+
+    The SWAP-like bond gate is not unitary, so neither state stays normalised.
+    Single-site gates are rounded to complex64, the precision of su2_exp.
+    """
+    dt = float(np.diff(r).mean())
+    h = PHI(r) ** 2
+    bell = np.array([1, 0, 0, 1], dtype=complex) / math.sqrt(2)
+    psi0 = functools.reduce(np.kron, [bell] * (n // 2))
+    half = np.eye(4) - 0.5j * dt * phase * er_chain._SWAP_LIKE
+    full = np.eye(4) - 1j * dt * phase * er_chain._SWAP_LIKE
+
+    def bonds(G, start):
+        return functools.reduce(np.matmul, [_embed(G, i, 2, n) for i in range(start, n - 1, 2)], np.eye(2 ** n))
+
+    even_half, odd_full = bonds(half, 0), bonds(full, 1)
+    psi = psi0
+    for hk in h:
+        gates = [expm(-0.5j * dt * ((-1) ** i * hk * Z + twist * X)).astype(np.complex64) for i in range(n)]
+        A = functools.reduce(np.matmul, [_embed(g, i, 1, n) for i, g in enumerate(gates)])
+        psi = A @ even_half @ odd_full @ even_half @ A @ psi
+    return psi0, psi
+
+
+@pytest.mark.parametrize("n", [2, 6])
+def test_chain_matches_dense_kron_evolution(n):
+    r = np.linspace(0.0, 1.0, 41)
+    psi0, psi = dense_evolve(r, n, 0.3, 0.8)
+    out = er_chain.er_chain_evolve(r, PHI, n, local_twist=0.3, entangling_phase=0.8, cutoff=0.0)
+    mps = out["state"].to_dense().ravel()
+    np.testing.assert_allclose(mps, psi, rtol=0, atol=1e-12 * np.linalg.norm(psi))
+    assert out["fidelity"] == pytest.approx(abs(np.vdot(psi0, psi)) ** 2, rel=1e-10)
+
+
+def test_recording_does_not_change_the_evolution():
+    r = np.linspace(0.0, 1.0, 41)
+    kw = dict(local_twist=0.3, entangling_phase=0.8, max_bond=4)
+    plain = er_chain.er_chain_evolve(r, PHI, 10, **kw)
+    recorded = er_chain.er_chain_evolve(r, PHI, 10, record_every=1, **kw)
+    assert len(recorded["history"]) == len(r)
+    assert recorded["fidelity"] == pytest.approx(plain["fidelity"], abs=1e-12)
+    a, b = plain["state"].to_dense().ravel(), recorded["state"].to_dense().ravel()
+    assert abs(np.vdot(a, b)) / (np.linalg.norm(a) * np.linalg.norm(b)) == pytest.approx(1.0, abs=1e-12)
+    np.testing.assert_allclose(recorded["entropies"], plain["entropies"], atol=1e-10)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+import torch
+
+from physics import er_epr
+
+
+def test_two_qubit_sweep_default_psi0_is_bell_state():
+    r = er_epr.radial_geodesic(0.0, 1.0, 33)
+    phi = lambda x: np.exp(-0.5 * (np.asarray(x) / 0.5) ** 2)
+    out = er_epr.two_qubit_sweep(r, phi, [0.0, 0.1], [0.0, 0.02])
+    assert out["fidelity"].shape == (1, 2, 2)
+    explicit = er_epr.two_qubit_sweep(r, phi, [0.0, 0.1], [0.0, 0.02], psi0=er_epr.bell_state())
+    assert torch.allclose(out["fidelity"], explicit["fidelity"])
+    # no twist and no entangling phase: the Bell state stays maximally entangled
+    assert abs(float(out["concurrence"][0, 0, 0]) - 1.0) < 1e-4
+
+
+def test_phi_interpolator_profiles_accept_arrays_and_options(tmp_path):
+    phi = er_epr.PhiFieldInterpolator(profile="gaussian", width=0.5, cache_dir=str(tmp_path))
+    r = np.linspace(-1.0, 1.0, 5)
+    np.testing.assert_allclose(phi(r), np.exp(-0.5 * (r / 0.5) ** 2))
+    assert isinstance(phi(0.25), float)
+    with np.testing.assert_raises(ValueError):
+        er_epr.PhiFieldInterpolator(profile="nope")(0.0)
+
+
+def test_bridge_propagator_single_path_with_a_batch_of_twists():
+    r = er_epr.radial_geodesic(nsteps=33)
+    phi = lambda x: np.exp(-x ** 2)
+    twists = np.array([0.0, 0.1, 0.3])
+    U = er_epr.bridge_propagator(r, phi, twist_strength=twists)
+    assert U.shape == (3, 2, 2)
+    for k, t in enumerate(twists):
+        ref = er_epr.bridge_propagator(r, phi, twist_strength=float(t))
+        assert torch.allclose(U[k], ref, atol=1e-6)
+    with pytest.raises(ValueError):
+        er_epr.bridge_propagator(np.stack([r, r]), phi, twist_strength=twists)
@@ -0,0 +1,33 @@
+import contextlib
+import io
+import math
+
+import pytest
+
+from metacognitive_dyad import MetacognitiveDyad
+
+
+@pytest.mark.parametrize("window", [1, 3, 9, 10, None])
+def test_reflect_with_a_short_history_window(window):
+    with contextlib.redirect_stdout(io.StringIO()):
+        dyad = MetacognitiveDyad(fast_boot_depth=16, history_window=window)
+    assert "Growth last 10 steps" in dyad.reflect()
+
+
+def test_jump_to_without_recording_leaves_history_behind():
+    with contextlib.redirect_stdout(io.StringIO()):
+        dyad = MetacognitiveDyad(fast_boot_depth=4)
+    dyad.jump_to(40)
+    assert dyad.depth == 40 and len(dyad.history) == 4
+
+
+@pytest.mark.parametrize("window", [None, 5, 16, 40])
+def test_log2_totals_are_chronological(window):
+    with contextlib.redirect_stdout(io.StringIO()):
+        dyad = MetacognitiveDyad(fast_boot_depth=0, history_window=window)
+    for k in range(24):
+        dyad.state = {'d': 3 + k, 'l': 50}         # unbalanced, so every total differs
+        dyad.step()
+    expected = [math.log2(rec['total']) for rec in dyad.history]
+    assert dyad.history.log2_totals().tolist() == expected
+    assert len(set(expected)) == len(expected) == min(24, window or 24)
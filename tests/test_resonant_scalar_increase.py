@@ -0,0 +1,39 @@
+import pytest
+
+import resonant_scalar_increase as rsi
+
+
+def _grid(tmp_path):
+    return rsi.ResonantScalarGrid(40, 60, cache_dir=str(tmp_path))
+
+
+def test_default_tolerances_stop_early(tmp_path):
+    g = _grid(tmp_path)
+    _, history = rsi.sovariel_recursion(rsi.build_initial_phi(g), g, n_iter=200, verbose=False)
+    assert history.converged and len(history) < 200
+
+
+def test_tol_none_disables_early_stopping(tmp_path):
+    g = _grid(tmp_path)
+    _, history = rsi.sovariel_recursion(rsi.build_initial_phi(g), g, n_iter=80, tol=None, verbose=False)
+    assert not history.converged and len(history) == 80
+
+
+def test_zero_iterations_return_the_initial_field(tmp_path):
+    g = _grid(tmp_path)
+    Phi0 = rsi.build_initial_phi(g)
+    Phi, history = rsi.sovariel_recursion(Phi0, g, n_iter=0, verbose=False)
+    assert len(history) == 0 and Phi is Phi0
+    _, history = rsi.reduced_sovariel_recursion(grid=g, n_iter=0, verbose=False)
+    assert len(history) == 0
+
+
+def test_bad_pyramid_depth_leaves_an_existing_coil_map_alone(tmp_path):
+    field = rsi.OutOfCoreField(16, 24, str(tmp_path / "ooc"), block_rows=8)
+    Phi = field.field(rsi.initial_amplitudes())
+    target = tmp_path / "coil.npy"
+    target.write_bytes(b"previous export")
+    with pytest.raises(ValueError):
+        field.export_coil_map(Phi, str(target), pyramid_levels=4)
+    assert target.read_bytes() == b"previous export"
+    assert not list(tmp_path.glob("coil_L*.npy"))
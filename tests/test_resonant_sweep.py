@@ -0,0 +1,19 @@
+import pytest
+
+import resonant_sweep
+
+
+def test_finished_points_are_stored_when_a_point_fails(tmp_path):
+    good = resonant_sweep.sweep_points(scale_factor=[3.0, 3.5, 4.0], grid=[(16, 24)])
+    bad = dict(good[0], amp_ratios={}, scale_factor=5.0)
+    out = str(tmp_path / "sweep")
+    with pytest.raises(KeyError):
+        resonant_sweep.run_sweep(good + [bad], out, workers=2, n_iter=3, verbose=False)
+    stored = resonant_sweep.SweepStore(out).completed_keys()
+    assert stored == {resonant_sweep.point_key(p) for p in good}
+
+
+def test_zero_iterations_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        resonant_sweep.run_sweep(resonant_sweep.sweep_points(grid=[(16, 24)]), str(tmp_path / "sweep"), n_iter=0)
+    assert not (tmp_path / "sweep").exists()
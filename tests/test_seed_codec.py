@@ -0,0 +1,125 @@
+import json
+import os
+import zlib
+
+import numpy as np
+import pytest
+
+from utils import seed_codec
+from utils.seed_packet import MAGIC_V2, load_packet, pack_v2
+
+
+def _cover(h=64, w=64, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+
+def _packet():
+    bricks = {f"f{i}_mod.py": f"def f{i}(x):\n    return g(x) + {i}\n" for i in range(40)}
+    bricks["g_mod.py"] = "def g(x):\n    return x * 2\n"
+    return {"version": "test", "brick_count": len(bricks), "bricks": bricks,
+            "graph": {f"f{i}_mod.py": ["g_mod.py"] for i in range(40)}}
+
+
+@pytest.mark.parametrize("size", [0, 1, 100, 1024])
+def test_lsb_round_trip(size):
+    cover = _cover()
+    payload = os.urandom(size)
+    stego = seed_codec.encode_lsb(cover, payload)
+    assert seed_codec.decode_lsb(stego) == payload
+    assert np.all((stego ^ cover) <= 1)
+    assert seed_codec.capacity(cover) == 64 * 64 * 3 // 8 - seed_codec.HEADER.size
+
+
+def test_encode_rejects_a_payload_over_capacity():
+    cover = _cover(8, 8)
+    with pytest.raises(ValueError):
+        seed_codec.encode_lsb(cover, bytes(seed_codec.capacity(cover) + 1))
+
+
+def test_corrupted_payload_fails_the_crc():
+    stego = seed_codec.encode_lsb(_cover(), b"lattice seed" * 20)
+    flat = stego.reshape(-1)
+    flat[8 * seed_codec.HEADER.size + 5] ^= 1
+    with pytest.raises(ValueError, match="checksum"):
+        seed_codec.decode_lsb(stego)
+
+
+def test_corrupted_length_is_rejected():
+    stego = seed_codec.encode_lsb(_cover(), b"lattice seed")
+    stego.reshape(-1)[32] ^= 1                  # top bit of the length field
+    with pytest.raises(ValueError):
+        seed_codec.decode_lsb(stego)
+
+
+def test_headerless_image_uses_the_legacy_layout_only_when_allowed():
+    seed = zlib.compress(b"legacy packet" * 10)
+    bits = np.unpackbits(np.frombuffer(seed, dtype=np.uint8))
+    arr = _cover() & 0xFE
+    arr.reshape(-1)[:len(bits)] |= bits
+    assert seed_codec.decode_lsb(arr) == seed
+    with pytest.raises(ValueError):
+        seed_codec.decode_lsb(arr, legacy=False)
+
+
+def test_v2_container_round_trip_and_lazy_bricks():
+    packet = _packet()
+    data = pack_v2(packet)
+    assert data[:4] == MAGIC_V2
+    loaded = load_packet(data)
+    assert loaded.container == "v2" and loaded.version == "test"
+    assert loaded.brick_count == packet["brick_count"]
+    assert loaded.bricks.n_loaded == 0
+    assert loaded.bricks["f3_mod.py"] == packet["bricks"]["f3_mod.py"]
+    assert loaded.bricks.n_loaded == 1
+    assert dict(loaded.bricks) == packet["bricks"]
+    assert loaded.callees("f7_mod.py") == ["g_mod.py"]
+
+
+def test_v1_seed_still_loads():
+    packet = _packet()
+    loaded = load_packet(zlib.compress(json.dumps(packet).encode()))
+    assert loaded.container == "v1"
+    assert loaded["bricks"] == packet["bricks"] and loaded["graph"] == packet["graph"]
+
+
+def test_seed_image_round_trip(tmp_path):
+    pytest.importorskip("PIL")
+    seed = pack_v2(_packet())
+    path = str(tmp_path / "seed.png")
+    assert seed_codec.save_seed_image(seed, path, size=(32, 32), max_size=(32, 4096)) == [path]
+    assert seed_codec.load_seed_image(path) == seed
+    assert load_packet(seed_codec.load_seed_image(path)).brick_count == 41
+
+
+def test_sharded_seed_round_trip(tmp_path):
+    pytest.importorskip("PIL")
+    seed = os.urandom(5000)
+    path = str(tmp_path / "seed.png")
+    paths = seed_codec.save_seed_image(seed, path, size=(16, 16), max_size=(16, 64))
+    assert len(paths) > 2 and paths[0] == path
+    assert paths[1] == seed_codec.shard_path(path, 1) == str(tmp_path / "seed_001.png")
+    assert seed_codec.load_seed_image(path, workers=2) == seed
+    assert b"".join(seed_codec.iter_seed_chunks(path, workers=1)) == seed
+    with pytest.raises(ValueError):
+        seed_codec.decode_lsb(seed_codec._read_image(path))
+    with pytest.raises(ValueError, match="not the first shard"):
+        seed_codec.load_seed_image(paths[1])
+
+
+def test_damaged_or_foreign_shard_is_rejected(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    seed = os.urandom(5000)
+    path = str(tmp_path / "seed.png")
+    paths = seed_codec.save_seed_image(seed, path, size=(16, 16), max_size=(16, 64))
+
+    arr = seed_codec._read_image(paths[1]).copy()
+    arr.reshape(-1)[8 * seed_codec.SHARD_HEADER.size + 3] ^= 1
+    Image.fromarray(arr).save(paths[1])
+    with pytest.raises(ValueError, match="checksum"):
+        seed_codec.load_seed_image(path)
+
+    other = str(tmp_path / "other.png")
+    other_paths = seed_codec.save_seed_image(os.urandom(5000), other, size=(16, 16), max_size=(16, 64))
+    os.replace(other_paths[1], paths[1])
+    with pytest.raises(ValueError, match="does not belong"):
+        seed_codec.load_seed_image(path)
@@ -2,49 +2,130 @@ import ast
 import hashlib
 import zlib
 import json
+import sys
 from collections import defaultdict
-from PIL import Image
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 import os
-def extract_bricks(root_dir: str) -> dict:
-    bricks = {}
-    seen = set()
+try:
+    from utils.seed_codec import save_seed_image
+    from utils.seed_packet import load_packet, pack_v2
+except ImportError:                     # run as a script: utils/ itself is on sys.path
+    from seed_codec import save_seed_image
+    from seed_packet import load_packet, pack_v2
+CACHE_PATH = os.path.join('seed', 'brick_cache.json')
+FINGERPRINT_PATH = os.path.join('seed', 'hash_seed.txt')
+CACHE_VERSION = 1
+def _python_files(root_dir: str) -> list:
+    """(path, rel) of every brick source under root_dir, in os.walk order."""
+    out = []
     for current_root, _, files in os.walk(root_dir):
         for file in files:
             if file.endswith('.py') and not file.startswith('__'):
                 path = os.path.join(current_root, file)
-                try:
-                    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                        code = f.read()
-                    tree = ast.parse(code)
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.FunctionDef):
-                            func_code = ast.get_source_segment(code, node)
-                            if func_code:
-                                h = hashlib.sha256(func_code.encode()).hexdigest()
-                                if h not in seen:
-                                    seen.add(h)
-                                    rel = os.path.relpath(path, root_dir).replace(os.sep, '_')
-                                    bricks[f"{node.name}_{rel}"] = func_code.strip()
-                except:
-                    continue
-    return bricks
-def build_seed():
-    unified_bricks = extract_bricks('.')
+                out.append((path, os.path.relpath(path, root_dir).replace(os.sep, '_')))
+    return out
+def _parse_file(code: str) -> list:
+    """One ast.parse per file: [name, source sha256, stripped source, called names] per function."""
+    try:
+        tree = ast.parse(code)
+    except Exception:
+        return []
+    out = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            func_code = ast.get_source_segment(code, node)
+            if func_code:
+                calls = [n.func.id for n in ast.walk(node) if isinstance(n, ast.Call) and isinstance(n.func, ast.Name)]
+                out.append([node.name, hashlib.sha256(func_code.encode()).hexdigest(), func_code.strip(), calls])
+    return out
+def _load_cache(cache_path) -> dict:
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION:
+            return cache['files']
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+def _save_cache(cache_path, files):
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'files': files}, f, separators=(',', ':'))
+    os.replace(tmp, cache_path)
+def scan_sources(root_dirs, cache_path=CACHE_PATH, workers=None) -> tuple:
+    """Parse every source under root_dirs once, reusing the cached parse of unchanged files.
+
+    The cache maps file path -> {content hash, functions}; only files whose
+    hash changed are parsed, on a process pool when there are many.  Returns
+    (per root: [(rel, functions)] in walk order, fingerprint of all paths and
+    content hashes).
+    """
+    cache = _load_cache(cache_path) if cache_path else {}
+    roots, todo = [], []
+    for root_dir in root_dirs:
+        entries = []
+        for path, rel in _python_files(root_dir):
+            try:
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    code = f.read()
+            except OSError:
+                continue
+            key, h = os.path.abspath(path), hashlib.sha256(code.encode()).hexdigest()
+            if cache.get(key, {}).get('hash') != h:
+                cache[key] = {'hash': h, 'functions': None}
+                todo.append((key, code))
+            entries.append((rel, key))
+        roots.append(entries)
+    if todo:
+        codes = [code for _, code in todo]
+        if len(todo) > 8 and workers != 1:
+            n = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(n) as pool:
+                parsed = list(pool.map(_parse_file, codes, chunksize=max(1, len(codes) // (4 * n))))
+        else:
+            parsed = [_parse_file(code) for code in codes]
+        for (key, _), functions in zip(todo, parsed):
+            cache[key]['functions'] = functions
+    live = {key for entries in roots for _, key in entries}
+    if cache_path and (todo or len(cache) != len(live)):
+        _save_cache(cache_path, {key: v for key, v in cache.items() if key in live})
+    listing = [[[rel, cache[key]['hash']] for rel, key in entries] for entries in roots]
+    fingerprint = hashlib.md5(json.dumps([CACHE_VERSION, listing]).encode()).hexdigest()
+    return [[(rel, cache[key]['functions']) for rel, key in entries] for entries in roots], fingerprint
+def _collect(entries) -> tuple:
+    """Bricks and their called names for one root; the first copy of a source wins."""
+    bricks, calls = {}, {}
+    seen = set()
+    for rel, functions in entries:
+        for name, h, func_code, called in functions:
+            if h not in seen:
+                seen.add(h)
+                bricks[f"{name}_{rel}"] = func_code
+                calls[f"{name}_{rel}"] = called
+    return bricks, calls
+def extract_bricks(root_dir: str, cache_path=CACHE_PATH, workers=None) -> dict:
+    (entries,), _ = scan_sources([root_dir], cache_path, workers)
+    return _collect(entries)[0]
+def seed_roots() -> list:
     sovariel_path = 'sovariel_core'
-    sovariel_bricks = extract_bricks(sovariel_path) if os.path.exists(sovariel_path) else {}
+    return ['.'] + ([sovariel_path] if os.path.exists(sovariel_path) else [])
+def build_seed(cache_path=CACHE_PATH, workers=None, scan=None, container="v2"):
+    """Seed bytes: a v2 container (seed_packet) or, with container="v1", the monolithic zlib(JSON).
+
+    `scan` reuses a scan_sources(seed_roots()) result.
+    """
+    roots, _ = scan or scan_sources(seed_roots(), cache_path, workers)
+    unified_bricks, unified_calls = _collect(roots[0])
+    sovariel_bricks, sovariel_calls = _collect(roots[1]) if len(roots) > 1 else ({}, {})
     all_bricks = {**unified_bricks, **sovariel_bricks}
+    all_calls = {**unified_calls, **sovariel_calls}
 
     graph = defaultdict(list)
-    for name, code in all_bricks.items():
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                    if node.func.id in all_bricks:
-                        graph[name].append(node.func.id)
-        except:
-            continue
+    for name in all_bricks:
+        for called in all_calls[name]:
+            if called in all_bricks:
+                graph[name].append(called)
 
     packet = {
         'version': '2025.12.12-final',
@@ -52,22 +133,30 @@ def build_seed():
         'bricks': all_bricks,
         'graph': dict(graph)
     }
+    if container == "v2":
+        return pack_v2(packet)
     return zlib.compress(json.dumps(packet, separators=(',', ':')).encode())
 def embed_seed_in_image(seed: bytes, output_path: str = "real_evieseed.png"):
-    img = Image.new('RGB', (512, 512), color=(8, 16, 32))
-    arr = np.array(img, dtype=np.uint8)
-    bits = ''.join(format(b, '08b') for b in seed)
-    idx = 0
-    for y in range(512):
-        for x in range(512):
-            for c in range(3):
-                if idx < len(bits):
-                    arr[y, x, c] = (arr[y, x, c] & 0xFE) | int(bits[idx])
-                    idx += 1
-    Image.fromarray(arr).save(output_path)
-    print(f"Generated {output_path} - {len(seed)} bytes compressed -> {os.path.getsize(output_path)} bytes on disk")
+    paths = save_seed_image(seed, output_path, size=(512, 512), color=(8, 16, 32))
+    on_disk = sum(os.path.getsize(p) for p in paths)
+    shards = f" in {len(paths)} shards" if len(paths) > 1 else ""
+    print(f"Generated {output_path}{shards} - {len(seed)} bytes compressed -> {on_disk} bytes on disk")
 if __name__ == "__main__":
-    seed = build_seed()
-    packet = json.loads(zlib.decompress(seed).decode())
-    print(f"Built seed with {packet['brick_count']} unique bricks, {len(seed)} bytes compressed")
+    output_path = "real_evieseed.png"
+    scan = scan_sources(seed_roots())
+    fingerprint = scan[1]
+    try:
+        with open(FINGERPRINT_PATH) as f:
+            previous = f.read().strip()
+    except OSError:
+        previous = None
+    if previous == fingerprint and os.path.exists(output_path) and '--force' not in sys.argv:
+        print(f"Seed up to date ({fingerprint}); nothing to rebuild")
+        sys.exit(0)
+    seed = build_seed(scan=scan)
+    packet = load_packet(seed)
+    print(f"Built {packet.container} seed with {packet.brick_count} unique bricks, {len(seed)} bytes compressed")
     embed_seed_in_image(seed)
+    os.makedirs(os.path.dirname(FINGERPRINT_PATH), exist_ok=True)
+    with open(FINGERPRINT_PATH, 'w') as f:
+        f.write(fingerprint)
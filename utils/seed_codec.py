@@ -0,0 +1,186 @@
+"""
+seed_codec.py
+
+Least-significant-bit image codec for the lattice seed.
+
+The payload is preceded by a 12-byte header: magic b"EVS1", then the payload
+length and its CRC-32 as big-endian uint32.  Header and payload are written
+MSB first into the low bit of every channel value, in row-major (y, x, c)
+order.  This is the bit order of the original generate_seed loop, so images
+without the header decode through the legacy path.  There the raw zlib
+stream starts at bit 0 and runs until it ends or the image does.
+
+save_seed_image never truncates.  A seed that does not fit the requested
+size goes into a taller image, up to max_size.  Beyond that it is split
+across images of max_size.  Each shard carries a 24-byte header: magic
+b"EVSS", its index and the shard count (uint16), the CRC-32 and length of
+the whole seed, and its own length and CRC-32.  Shard 0 is written to the
+requested path and shard i to <stem>_<i:03d><ext>.  Encoding writes one
+shard at a time.  Decoding inflates up to `workers` shards in parallel
+threads and checks every CRC.
+"""
+
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+MAGIC = b"EVS1"
+HEADER = struct.Struct(">4sII")          # magic, payload length, crc32
+SHARD_MAGIC = b"EVSS"
+SHARD_HEADER = struct.Struct(">4sHHIIII")  # magic, index, count, seed crc32, seed length, shard length, shard crc32
+
+def capacity(shape) -> int:
+    """Payload bytes an image of `shape` (or an array) can carry after the header."""
+    shape = getattr(shape, "shape", shape)
+    return int(np.prod(shape)) // 8 - HEADER.size
+
+def _embed(cover, data):
+    if 8 * len(data) > np.size(cover):
+        raise ValueError(f"{len(data)} bytes with header exceed the image capacity of {np.size(cover) // 8} bytes")
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    out = np.array(cover, dtype=np.uint8, copy=True)
+    flat = out.reshape(-1)
+    flat[:len(bits)] = (flat[:len(bits)] & 0xFE) | bits
+    return out
+
+def encode_lsb(cover: np.ndarray, payload: bytes) -> np.ndarray:
+    """Copy of the uint8 cover array with header + payload in its low bits."""
+    return _embed(cover, HEADER.pack(MAGIC, len(payload), zlib.crc32(payload)) + bytes(payload))
+
+def encode_shard(cover, chunk, index, count, seed_crc, seed_len):
+    """Cover with one shard of a seed (see the module docstring for the header)."""
+    header = SHARD_HEADER.pack(SHARD_MAGIC, index, count, seed_crc, seed_len, len(chunk), zlib.crc32(chunk))
+    return _embed(cover, header + bytes(chunk))
+
+def _read_bytes(flat, start, n):
+    """n bytes from the low bits starting at byte offset `start`."""
+    return np.packbits(flat[8 * start:8 * (start + n)] & 1).tobytes()
+
+def decode_lsb(arr: np.ndarray, legacy: bool = True) -> bytes:
+    """Payload embedded by encode_lsb.
+
+    Without the header, legacy=True falls back to the headerless layout: the
+    zlib stream from bit 0, cut at its end (or the whole plane if the stream
+    is truncated, which zlib.decompress then reports).  Raises ValueError on
+    a length or CRC mismatch, or on a headerless image with legacy=False.
+    """
+    flat = np.asarray(arr, dtype=np.uint8).reshape(-1)
+    magic, length, crc = HEADER.unpack(_read_bytes(flat, 0, HEADER.size))
+    if magic == SHARD_MAGIC:
+        raise ValueError("image is one shard of a multi-image seed; use load_seed_image on its first shard")
+    if magic == MAGIC:
+        if length > capacity(flat.shape):
+            raise ValueError(f"header claims {length} bytes, image holds at most {capacity(flat.shape)}")
+        payload = _read_bytes(flat, HEADER.size, length)
+        if zlib.crc32(payload) != crc:
+            raise ValueError("seed checksum mismatch: image is damaged or was re-encoded lossily")
+        return payload
+    if not legacy:
+        raise ValueError("image carries no seed header")
+    plane = np.packbits(flat & 1).tobytes()
+    d = zlib.decompressobj()
+    try:
+        d.decompress(plane)
+    except zlib.error:
+        return plane
+    return plane[:len(plane) - len(d.unused_data)] if d.eof else plane
+
+def decode_shard(arr: np.ndarray):
+    """(header dict, chunk) of a shard image; raises ValueError on a CRC mismatch."""
+    flat = np.asarray(arr, dtype=np.uint8).reshape(-1)
+    magic, index, count, seed_crc, seed_len, length, crc = SHARD_HEADER.unpack(_read_bytes(flat, 0, SHARD_HEADER.size))
+    if magic != SHARD_MAGIC:
+        raise ValueError("image is not a seed shard")
+    if SHARD_HEADER.size + length > flat.size // 8:
+        raise ValueError(f"shard {index} claims {length} bytes, more than the image holds")
+    chunk = _read_bytes(flat, SHARD_HEADER.size, length)
+    if zlib.crc32(chunk) != crc:
+        raise ValueError(f"seed shard {index} checksum mismatch")
+    return {"index": index, "count": count, "seed_crc": seed_crc, "seed_len": seed_len}, chunk
+
+def shard_path(path: str, index: int) -> str:
+    stem, ext = os.path.splitext(path)
+    return path if index == 0 else f"{stem}_{index:03d}{ext}"
+
+def _cover(size, color):
+    cover = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    cover[...] = color
+    return cover
+
+def save_seed_image(seed: bytes, path: str, size=(512, 512), color=(8, 16, 32), max_size=(512, 4096)) -> list:
+    """Embed seed losslessly into solid-colour RGB image(s); returns the paths written.
+
+    The image is `size` (width, height) if the seed fits, else as tall as
+    needed up to max_size, else the seed is sharded over max_size images.
+    """
+    from PIL import Image
+    seed = memoryview(seed)
+    width = size[0]
+    rows = -(-8 * (HEADER.size + len(seed)) // (3 * width))
+    if rows <= max(size[1], max_size[1]):
+        Image.fromarray(encode_lsb(_cover((width, max(size[1], rows)), color), seed)).save(path)
+        return [path]
+    room = 3 * max_size[0] * max_size[1] // 8 - SHARD_HEADER.size
+    count = -(-len(seed) // room)
+    if count > 0xFFFF:
+        raise ValueError(f"seed of {len(seed)} bytes needs {count} shards, more than the format allows")
+    seed_crc = zlib.crc32(seed)
+    cover = _cover(max_size, color)
+    paths = []
+    for i in range(count):
+        chunk = seed[i * room:(i + 1) * room]
+        paths.append(shard_path(path, i))
+        Image.fromarray(encode_shard(cover, chunk, i, count, seed_crc, len(seed))).save(paths[-1])
+    return paths
+
+def _read_image(path):
+    from PIL import Image
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"))
+
+def _load_shard(path):
+    return decode_shard(_read_image(path))
+
+def iter_seed_chunks(path: str, workers: int = 4):
+    """Yield the seed's bytes shard by shard, in order, from the first shard's path.
+
+    At most `workers` shards are decoded (in threads) at any time, so memory
+    stays bounded whatever the shard count.  A single-image seed yields once.
+    """
+    arr = _read_image(path)
+    if _read_bytes(arr.reshape(-1), 0, 4) != SHARD_MAGIC:
+        yield decode_lsb(arr)
+        return
+    first, chunk = decode_shard(arr)
+    del arr
+    count, seed_crc, seed_len = first["count"], first["seed_crc"], first["seed_len"]
+    if first["index"] != 0:
+        raise ValueError(f"{path} is shard {first['index']}, not the first shard")
+    crc, n = zlib.crc32(chunk), len(chunk)
+    yield chunk
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        pending = []
+        next_index = 1
+        while next_index < count or pending:
+            while next_index < count and len(pending) < max(1, workers):
+                pending.append((next_index, pool.submit(_load_shard, shard_path(path, next_index))))
+                next_index += 1
+            index, fut = pending.pop(0)
+            info, chunk = fut.result()
+            if (info["index"], info["count"], info["seed_crc"], info["seed_len"]) != (index, count, seed_crc, seed_len):
+                raise ValueError(f"{shard_path(path, index)} does not belong to this seed")
+            crc, n = zlib.crc32(chunk, crc), n + len(chunk)
+            yield chunk
+    if n != seed_len or crc != seed_crc:
+        raise ValueError("seed checksum mismatch across shards")
+
+def load_seed_image(path: str, legacy: bool = True, workers: int = 4) -> bytes:
+    """Seed bytes from an image written by save_seed_image (sharded or not) or the legacy encoder."""
+    arr = _read_image(path)
+    if _read_bytes(arr.reshape(-1), 0, 4) != SHARD_MAGIC:
+        return decode_lsb(arr, legacy=legacy)
+    del arr
+    return b"".join(iter_seed_chunks(path, workers))
@@ -0,0 +1,135 @@
+"""
+seed_packet.py
+
+Seed container formats.
+
+v1 is the original monolithic packet: zlib(JSON {version, brick_count,
+bricks, graph}).  v2 stores every brick as its own raw-deflate frame.  The
+frames share a preset dictionary built from lines common across bricks, so
+small frames still compress well.  An up-front index lets a reader inflate
+only the bricks it touches.  The image codec's CRC covers the whole
+container, so the frames carry no checksum of their own.
+
+v2 layout (big-endian):
+    b"EVS2" | uint32 index_len | uint32 dict_len | index | zlib(dictionary) | frames
+index = zlib(JSON {"version", "names", "offsets", "lengths", "graph"}), where
+offsets are relative to the first frame and graph maps a brick's position
+in names to the positions of the bricks it calls.
+
+load_packet() reads either format into a Packet.
+"""
+
+import json
+import struct
+import zlib
+from collections import Counter
+from collections.abc import Mapping
+
+MAGIC_V2 = b"EVS2"
+_HEAD = struct.Struct(">4sII")
+ZDICT_SIZE = 32 * 1024      # zlib uses at most a 32 KB window
+_WBITS = -15                # raw deflate: no per-frame header or adler32
+
+def build_zdict(sources, size=ZDICT_SIZE) -> bytes:
+    """Preset dictionary: the lines shared by most bricks, the most valuable last (closest to the data)."""
+    counts = Counter(line for src in sources for line in set(src.splitlines()) if len(line.strip()) > 3)
+    ranked = sorted((c * len(line), line) for line, c in counts.items() if c > 1)
+    out, total = [], 0
+    for _, line in reversed(ranked):
+        chunk = (line + "\n").encode()
+        if total + len(chunk) > size:
+            continue
+        out.append(chunk)
+        total += len(chunk)
+    return b"".join(reversed(out))
+
+def pack_v2(packet: dict, level=9) -> bytes:
+    """v2 container of a packet dict {version, bricks, graph}."""
+    names = list(packet['bricks'])
+    sources = [packet['bricks'][n] for n in names]
+    zdict = build_zdict(sources)
+    frames, offsets, lengths, pos = [], [], [], 0
+    for src in sources:
+        c = zlib.compressobj(level, zlib.DEFLATED, _WBITS, zdict=zdict)
+        frame = c.compress(src.encode()) + c.flush()
+        frames.append(frame)
+        offsets.append(pos)
+        lengths.append(len(frame))
+        pos += len(frame)
+    position = {n: i for i, n in enumerate(names)}
+    graph = {str(position[n]): [position[c] for c in calls] for n, calls in packet.get('graph', {}).items()}
+    index = zlib.compress(json.dumps({'version': packet['version'], 'names': names, 'offsets': offsets,
+                                      'lengths': lengths, 'graph': graph}, separators=(',', ':')).encode(), level)
+    zdict_z = zlib.compress(zdict, level)
+    return _HEAD.pack(MAGIC_V2, len(index), len(zdict_z)) + index + zdict_z + b"".join(frames)
+
+class LazyBricks(Mapping):
+    """name -> source, inflating a frame on first access only."""
+
+    def __init__(self, data, base, names, offsets, lengths, zdict):
+        self._data = data
+        self._base = base
+        self._slots = {n: (o, l) for n, o, l in zip(names, offsets, lengths)}
+        self._names = names
+        self._zdict = zdict
+        self._cache = {}
+
+    def __getitem__(self, name):
+        if name not in self._cache:
+            off, n = self._slots[name]
+            d = zlib.decompressobj(_WBITS, zdict=self._zdict)
+            start = self._base + off
+            self._cache[name] = (d.decompress(self._data[start:start + n]) + d.flush()).decode()
+        return self._cache[name]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._slots
+
+    @property
+    def n_loaded(self):
+        return len(self._cache)
+
+class Packet:
+    """Seed packet: version, brick_count, bricks (a mapping) and graph (name -> called names).
+
+    For v2 only the index is read up front; bricks inflate on access.
+    packet['bricks'] style access is kept for code written against the v1 dict.
+    """
+
+    def __init__(self, version, bricks, graph, container):
+        self.version = version
+        self.bricks = bricks
+        self.graph = graph
+        self.container = container
+
+    @property
+    def brick_count(self):
+        return len(self.bricks)
+
+    def __getitem__(self, key):
+        if key in ("version", "brick_count", "bricks", "graph"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def callees(self, name):
+        return self.graph.get(name, [])
+
+def load_packet(data: bytes) -> Packet:
+    """Packet from v2 container bytes or a v1 zlib(JSON) seed."""
+    data = memoryview(data)
+    if bytes(data[:4]) == MAGIC_V2:
+        _, index_len, dict_len = _HEAD.unpack(data[:_HEAD.size])
+        index = json.loads(zlib.decompress(data[_HEAD.size:_HEAD.size + index_len]))
+        zdict = zlib.decompress(data[_HEAD.size + index_len:_HEAD.size + index_len + dict_len])
+        names = index['names']
+        bricks = LazyBricks(data, _HEAD.size + index_len + dict_len, names, index['offsets'], index['lengths'], zdict)
+        graph = {names[int(i)]: [names[j] for j in calls] for i, calls in index['graph'].items()}
+        return Packet(index['version'], bricks, graph, "v2")
+    packet = json.loads(zlib.decompress(data))
+    return Packet(packet['version'], packet['bricks'], packet.get('graph', {}), "v1")